@@ -9,12 +9,24 @@ CLI da Lumin rodando sobre o ODG / ACI4A.
   - ledger/ e models/ são locais (e ignorados pelo Git)
 """
 
+import logging
+import threading
 from pathlib import Path
 
+# prompt_toolkit é opcional: histórico/edição de linha no prompt.
+# Sem ele, cai no input() padrão.
+try:
+    from prompt_toolkit import PromptSession
+except ImportError:
+    PromptSession = None
+
 from engine.orchestrator import ODGOrchestrador
 
 
 def main() -> None:
+    # Logs de boot das camadas (ex.: [CAMADA 0]) vão para o terminal
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Raiz do repositório: pasta onde está este arquivo LUMIN.py
     base_dir = Path(__file__).resolve().parent
 
@@ -30,12 +42,17 @@ def main() -> None:
         ledger_owner="LUMIN_PUBLIC",
     )
 
+    # Aquece o pipeline em segundo plano enquanto o usuário digita
+    threading.Thread(target=orchestrador.warmup, daemon=True).start()
+
     print("Lumin carregada com sucesso!")
     print("Digite 'sair' para encerrar.\n")
 
+    ler_linha = PromptSession().prompt if PromptSession is not None else input
+
     while True:
         try:
-            user_input = input("Você: ").strip()
+            user_input = ler_linha("Você: ").strip()
         except (EOFError, KeyboardInterrupt):
             print("\nLumin: Encerrando sessão de forma segura. Até logo.")
             break
@@ -1,13 +1,159 @@
+import asyncio
 import json
+import logging
 import os
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 
+from engine.fsm_axiomas import FSMAxiomas
 from engine.ledger_ops import load_for_session, load_civilizational_snapshot
 
+# orjson é opcional: parser em Rust, bem mais rápido que o json da stdlib.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson é opcional: permite ler só a subárvore "axiomas" em streaming,
+# sem materializar o resto do documento.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Cache dos axiomas já parseados: path -> (st_mtime_ns, st_size, axiomas).
+# Reboots no mesmo processo (testes, reinícios a quente) reaproveitam o dict
+# enquanto o arquivo não mudar em disco. Só a subárvore "axiomas" fica
+# retida; o dict é compartilhado, não copiado: ninguém a jusante o modifica.
+_MASTER_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
+
+# Logger da Camada 0. Sem handler configurado (NullHandler), as mensagens
+# são descartadas sem I/O; o LUMIN.py liga a saída no terminal.
+_logger = logging.getLogger("camada0")
+_logger.addHandler(logging.NullHandler())
+
 
 def _log(msg: str) -> None:
     """Log centralizado da Camada 0."""
-    print(f"[CAMADA 0] {msg}")
+    if _logger.isEnabledFor(logging.INFO):
+        _logger.info("[CAMADA 0] %s", msg)
+
+
+# Pool de I/O do boot: o ledger de sessão e o snapshot civilizatório são
+# lidos em paralelo com o master JSON, em vez de um arquivo após o outro.
+# Criado sob demanda para não abrir threads só por importar o módulo.
+_IO_POOL: Optional[ThreadPoolExecutor] = None
+
+
+def _io_pool() -> ThreadPoolExecutor:
+    global _IO_POOL
+    if _IO_POOL is None:
+        _IO_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="camada0-io")
+    return _IO_POOL
+
+
+# Ganchos opcionais que a FSM pode expor, resolvidos uma vez por classe:
+# type(fsm) -> (init_from_memory, validate, apply_civilizational_modulators).
+_GANCHOS_FSM: Dict[type, Tuple[bool, bool, bool]] = {}
+
+
+def _ganchos_fsm(fsm_obj: Any) -> Tuple[bool, bool, bool]:
+    """Quais ganchos opcionais a classe da FSM implementa (com cache)."""
+    cls = type(fsm_obj)
+    ganchos = _GANCHOS_FSM.get(cls)
+    if ganchos is None:
+        ganchos = (
+            hasattr(cls, "init_from_memory"),
+            hasattr(cls, "validate"),
+            hasattr(cls, "apply_civilizational_modulators"),
+        )
+        _GANCHOS_FSM[cls] = ganchos
+    return ganchos
+
+
+# ===============================================================
+# Resultado de boot com falha
+# ===============================================================
+def _fail(fsm_obj: Optional[Any], msg: str) -> Dict[str, Any]:
+    """
+    Monta o retorno de um boot abortado por erro fatal.
+
+    Os dicts internos são novos a cada chamada: quem recebe o resultado
+    pode preenchê-los sem afetar boots futuros.
+    """
+    return {
+        "fsm": fsm_obj,
+        "session_memory": {},
+        "civilizational_stats": {},
+        "prognostico_inicial": {},
+        "ok": False,
+        "errors": [msg],
+    }
+
+
+# ===============================================================
+# Resolução de caminhos do boot
+# ===============================================================
+_MASTER_NOME = "odg_master_v0.2.json"
+_RAIZ_PADRAO = Path(__file__).resolve().parent.parent
+
+
+def _resolver_caminhos(base_dir: Optional[str]) -> Tuple[str, str]:
+    """
+    Resolve (base_dir absoluto, caminho do master JSON) para um base_dir.
+
+    O master JSON é procurado em config/ (layout documentado) e, se não
+    estiver lá, na raiz do base_dir. Sem cache: a sondagem custa uma
+    chamada a is_file() e acompanha o arquivo se ele for movido.
+    """
+    base = _RAIZ_PADRAO if base_dir is None else Path(base_dir).resolve()
+    master = base / "config" / _MASTER_NOME
+    if not master.is_file():
+        master = base / _MASTER_NOME
+    return str(base), str(master)
+
+
+# ===============================================================
+# Leitura dos axiomas do master JSON (com cache por mtime)
+# ===============================================================
+_SEM_AXIOMAS = object()
+
+
+def _read_master_axiomas(master_path: str) -> Any:
+    """
+    Lê a chave "axiomas" do odg_master_v0.2.json, reaproveitando o cache
+    quando (mtime, tamanho) do arquivo não mudaram desde a última leitura.
+
+    Com ijson, apenas a subárvore "axiomas" é construída em memória;
+    sem ele, o documento é parseado inteiro (orjson ou json) e o resto
+    é descartado logo em seguida.
+
+    Levanta KeyError se o documento não tiver "axiomas".
+    """
+    st = os.stat(master_path)
+    cached = _MASTER_CACHE.get(master_path)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    if ijson is not None:
+        with open(master_path, "rb") as f:
+            axiomas = next(ijson.items(f, "axiomas", use_float=True), _SEM_AXIOMAS)
+    else:
+        if orjson is not None:
+            with open(master_path, "rb") as f:
+                data = orjson.loads(f.read())
+        else:
+            with open(master_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        axiomas = data.get("axiomas", _SEM_AXIOMAS) if isinstance(data, dict) else _SEM_AXIOMAS
+
+    if axiomas is _SEM_AXIOMAS:
+        raise KeyError("axiomas")
+
+    _MASTER_CACHE[master_path] = (st.st_mtime_ns, st.st_size, axiomas)
+    return axiomas
 
 
 # ===============================================================
@@ -122,10 +268,7 @@ def camada0_boot(
     # -----------------------------------------------------------
     # 0.0 — Determinar diretório base
     # -----------------------------------------------------------
-    if base_dir is None:
-        base_dir = os.path.dirname(os.path.dirname(__file__))
-
-    base_dir = os.path.abspath(base_dir)
+    base_dir, master_path = _resolver_caminhos(base_dir)
     _log(f"Base dir resolvido: {base_dir}")
 
     # -----------------------------------------------------------
@@ -133,71 +276,42 @@ def camada0_boot(
     # -----------------------------------------------------------
     if fsm_obj is None:
         try:
-            from engine.fsm_axiomas import FSMAxiomas
             fsm_obj = FSMAxiomas()
             _log("FSMAxiomas instanciada automaticamente.")
         except Exception as e:
             msg = f"ERRO: Não foi possível instanciar FSMAxiomas: {e}"
             _log(msg)
-            return {
-                "fsm": None,
-                "session_memory": {},
-                "civilizational_stats": {},
-                "prognostico_inicial": {},
-                "ok": False,
-                "errors": [msg],
-            }
+            return _fail(None, msg)
 
     # -----------------------------------------------------------
-    # 0.2 — Localizar arquivo de axiomas
+    # 0.2 / 0.3 — Localizar e carregar arquivo de axiomas
     # -----------------------------------------------------------
-    master_path = os.path.join(base_dir, "odg_master_v0.2.json")
-
-    if not os.path.exists(master_path):
-        msg = "ERRO: odg_master_v0.2.json não encontrado."
-        _log(msg)
-        return {
-            "fsm": fsm_obj,
-            "session_memory": {},
-            "civilizational_stats": {},
-            "prognostico_inicial": {},
-            "ok": False,
-            "errors": [msg],
-        }
+    # master_path já vem resolvido de 0.0 (config/ ou raiz do base_dir).
 
-    _log(f"Axiomas localizados em: {master_path}")
+    # Ledger de sessão e snapshot civilizatório não dependem dos axiomas:
+    # as leituras são disparadas já, e ficam em voo enquanto o master
+    # JSON é lido e parseado nesta thread. Os resultados são coletados
+    # nas etapas 0.3 e 0.4, na mesma ordem de antes.
+    pool = _io_pool()
+    fut_sessao = pool.submit(load_for_session, base_dir)
+    fut_civ = pool.submit(_load_civilizational_stats, base_dir)
 
-    # -----------------------------------------------------------
-    # 0.3 — Carregar axiomas
-    # -----------------------------------------------------------
     try:
-        with open(master_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    except Exception as e:
-        msg = f"ERRO ao carregar master JSON: {e}"
+        axiomas_dict = _read_master_axiomas(master_path)
+    except FileNotFoundError:
+        msg = "ERRO: odg_master_v0.2.json não encontrado."
         _log(msg)
-        return {
-            "fsm": fsm_obj,
-            "session_memory": {},
-            "civilizational_stats": {},
-            "prognostico_inicial": {},
-            "ok": False,
-            "errors": [msg],
-        }
-
-    if "axiomas" not in data:
+        return _fail(fsm_obj, msg)
+    except KeyError:
         msg = "ERRO: JSON não contém 'axiomas'."
         _log(msg)
-        return {
-            "fsm": fsm_obj,
-            "session_memory": {},
-            "civilizational_stats": {},
-            "prognostico_inicial": {},
-            "ok": False,
-            "errors": [msg],
-        }
+        return _fail(fsm_obj, msg)
+    except Exception as e:
+        msg = f"ERRO ao carregar master JSON: {e}"
+        _log(msg)
+        return _fail(fsm_obj, msg)
 
-    axiomas_dict = data["axiomas"]
+    _log(f"Axiomas carregados de: {master_path}")
 
     try:
         fsm_obj.load_axiomas(axiomas_dict)
@@ -205,20 +319,13 @@ def camada0_boot(
     except Exception as e:
         msg = f"ERRO ao carregar axiomas na FSM: {e}"
         _log(msg)
-        return {
-            "fsm": fsm_obj,
-            "session_memory": {},
-            "civilizational_stats": {},
-            "prognostico_inicial": {},
-            "ok": False,
-            "errors": [msg],
-        }
+        return _fail(fsm_obj, msg)
 
     # -----------------------------------------------------------
     # 0.3 — Carregar memória de sessão (ledger individual)
     # -----------------------------------------------------------
     try:
-        session_memory = load_for_session(base_dir)
+        session_memory = fut_sessao.result()
     except Exception as e:
         msg = f"ERRO ao carregar ledger da sessão: {e}"
         _log(msg)
@@ -233,7 +340,7 @@ def camada0_boot(
     # -----------------------------------------------------------
     # 0.4 — Carregar estatísticas civilizatórias (Ledger Civilizatório)
     # -----------------------------------------------------------
-    civilizational_stats = _load_civilizational_stats(base_dir)
+    civilizational_stats = fut_civ.result()
     if civilizational_stats.get("available"):
         _log("Estatísticas civilizatórias carregadas a partir do ledger.")
     else:
@@ -251,7 +358,9 @@ def camada0_boot(
     # -----------------------------------------------------------
     # Reidratar FSM + validar axiomas
     # -----------------------------------------------------------
-    if hasattr(fsm_obj, "init_from_memory"):
+    tem_init, tem_validate, tem_moduladores = _ganchos_fsm(fsm_obj)
+
+    if tem_init:
         try:
             fsm_obj.init_from_memory(session_memory)
             _log("FSM reidratada a partir do ledger.")
@@ -260,7 +369,7 @@ def camada0_boot(
             _log(msg)
             errors.append(msg)
 
-    if hasattr(fsm_obj, "validate"):
+    if tem_validate:
         try:
             fsm_obj.validate()
             _log("FSM validada com sucesso.")
@@ -272,7 +381,7 @@ def camada0_boot(
     # -----------------------------------------------------------
     # PILAR 2 — Aplicar moduladores evolutivos (se existir método)
     # -----------------------------------------------------------
-    if hasattr(fsm_obj, "apply_civilizational_modulators"):
+    if tem_moduladores:
         try:
             fsm_obj.apply_civilizational_modulators(
                 civilizational_stats=civilizational_stats,
@@ -300,3 +409,22 @@ def camada0_boot(
         "ok": ok,
         "errors": errors,
     }
+
+
+async def camada0_boot_async(
+    fsm_obj: Optional[Any] = None,
+    base_dir: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Versão assíncrona de camada0_boot para servidores multi-sessão.
+
+    O boot roda em uma thread do executor padrão, então as leituras de
+    disco (axiomas, ledger de sessão, snapshot civilizatório) de várias
+    sessões bootando ao mesmo tempo ficam em voo simultaneamente, sem
+    bloquear o event loop:
+
+        boots = await asyncio.gather(*(
+            camada0_boot_async(base_dir=d) for d in dirs
+        ))
+    """
+    return await asyncio.to_thread(camada0_boot, fsm_obj, base_dir)
@@ -1,6 +1,137 @@
 # engine/fsm_axiomas.py
 
-from typing import Any, Dict, List, Optional
+from typing import AbstractSet, Any, Dict, Iterable, Optional, Tuple
+
+
+# ----------------------------------------------------------------------
+# Conjuntos de eventos (montados uma vez, no import)
+# ----------------------------------------------------------------------
+# A1 - risco duro: explícito + vetorial
+_RISCO_DURO = frozenset((
+    "self_harm_flag", "chemistry_flag", "violence_flag",
+    "intent_selfharm_latent", "intent_chemistry_latent", "intent_extreme_scenario",
+))
+
+# A1 - risco suave: manipulação / fracionamento
+_RISCO_SUAVE = frozenset((
+    "risk_manipulacao", "risk_fracionado",
+))
+
+# A2 - eventos que levam à incerteza
+_A2_INCERTEZA = frozenset((
+    "meta_query_flag", "ambiguity_high",
+))
+
+_SEM_EVENTOS: AbstractSet[str] = frozenset()
+
+# Níveis de risco civilizatório que endurecem os moduladores
+_NIVEIS_ALTOS = frozenset(("medium", "high"))
+
+
+# ----------------------------------------------------------------------
+# Tabelas de transição (estado atual × máscara de eventos -> próximo estado)
+# ----------------------------------------------------------------------
+# Bits da máscara de A1
+_EV_DURO = 1
+_EV_SUAVE = 2
+_EV_AMBIGUIDADE = 4
+_EV_NO_RISK = 8
+_RIGIDEZ_BRANDA = 16  # rigidez_a1 < 1.0
+
+# Bits da máscara de A2
+_EV_INCERTEZA = 1
+_EV_A2_NO_RISK = 2
+
+_A1_ESTADOS = ("A1_SAFE_FLOW", "A1_QUERY", "A1_RISK")
+_A1_INDICE = {nome: i for i, nome in enumerate(_A1_ESTADOS)}
+_A1_OUTRO = len(_A1_ESTADOS)  # qualquer estado fora da tabela (ex: A1_OVERRIDE)
+
+
+def _regra_a1(estado: Optional[str], mask: int) -> Optional[str]:
+    """
+    Regra de referência de A1 (preservação da vida), usada só para montar
+    _A1_LUT no import. Retorna o próximo estado ou None (mantém o atual).
+    """
+    if mask & _EV_DURO:
+        # rigidez alta → cai direto em RISK; num cenário mais brando
+        # poderíamos cair em QUERY, mas mantemos conservador.
+        return "A1_QUERY" if mask & _RIGIDEZ_BRANDA else "A1_RISK"
+    if mask & _EV_SUAVE and estado == "A1_SAFE_FLOW":
+        return "A1_QUERY"
+    if mask & _EV_AMBIGUIDADE and estado == "A1_SAFE_FLOW":
+        return "A1_QUERY"
+    if mask & _EV_NO_RISK and estado in ("A1_QUERY", "A1_RISK"):
+        return "A1_SAFE_FLOW"
+    return None
+
+
+def _regra_a2(baseline: bool, mask: int) -> Optional[str]:
+    """
+    Regra de referência de A2 (verdade / não-delírio), usada só para montar
+    _A2_LUT no import. Retorna o próximo estado ou None (mantém o atual).
+    """
+    if mask & _EV_INCERTEZA:
+        # Se sensibilidade for maior que 1, podemos no futuro
+        # elevar para estados mais fortes (ex: DELIRIUM_RISK).
+        return "A2_UNCERTAINTY"
+    if mask & _EV_A2_NO_RISK and not baseline:
+        return "A2_BASELINE"
+    return None
+
+
+_A1_LUT = tuple(
+    tuple(_regra_a1(estado, mask) for mask in range(32))
+    for estado in _A1_ESTADOS + (None,)
+)
+
+# Índice 0: estado atual diferente de A2_BASELINE; índice 1: A2_BASELINE.
+_A2_LUT = tuple(
+    tuple(_regra_a2(baseline, mask) for mask in range(4))
+    for baseline in (False, True)
+)
+
+
+def _como_conjunto(eventos: Optional[Iterable[Any]]) -> AbstractSet[str]:
+    """
+    Normaliza os eventos para um conjunto de strings.
+
+    set/frozenset vindos do chamador são usados como estão (sem cópia);
+    listas só passam por str() quando há algum item que não é string.
+    Geradores e iteradores são materializados antes: só dá para
+    percorrê-los uma vez, e a checagem de tipo abaixo os esgotaria.
+    """
+    if not eventos:
+        return _SEM_EVENTOS
+    if isinstance(eventos, (set, frozenset)):
+        return eventos
+    if not isinstance(eventos, (list, tuple)):
+        eventos = tuple(eventos)
+    if all(type(e) is str for e in eventos):
+        return frozenset(eventos)
+    return frozenset(map(str, eventos))
+
+
+def _mascaras(evset: AbstractSet[str], rigidez_a1: float) -> Tuple[int, int]:
+    """Reduz um conjunto de eventos às máscaras (A1, A2) das tabelas."""
+    mask_a1 = 0
+    if not _RISCO_DURO.isdisjoint(evset):
+        mask_a1 |= _EV_DURO
+    if not _RISCO_SUAVE.isdisjoint(evset):
+        mask_a1 |= _EV_SUAVE
+    if "ambiguity_high" in evset:
+        mask_a1 |= _EV_AMBIGUIDADE
+    if "no_risk" in evset:
+        mask_a1 |= _EV_NO_RISK
+    if rigidez_a1 < 1.0:
+        mask_a1 |= _RIGIDEZ_BRANDA
+
+    mask_a2 = 0
+    if not _A2_INCERTEZA.isdisjoint(evset):
+        mask_a2 |= _EV_INCERTEZA
+    if "no_risk" in evset:
+        mask_a2 |= _EV_A2_NO_RISK
+
+    return mask_a1, mask_a2
 
 
 class FSMAxiomas:
@@ -31,18 +162,30 @@ class FSMAxiomas:
         - sensibilidade: quão fácil o axioma entra em estados de alerta/uncertainty.
     """
 
+    __slots__ = ("axiomas", "estados", "moduladores", "_dirty", "_snapshot_cache")
+
+    # Defaults de segurança para os axiomas críticos (A1, A2)
+    _DEFAULT_STATES: Dict[str, str] = {"A1": "A1_SAFE_FLOW", "A2": "A2_BASELINE"}
+    _DEFAULT_MODS: Dict[str, Dict[str, float]] = {
+        "A1": {"rigidez": 1.0, "sensibilidade": 1.0},
+        "A2": {"rigidez": 1.0, "sensibilidade": 1.0},
+    }
+
     def __init__(self, axiomas_dict: Optional[Dict[str, Any]] = None) -> None:
         self.axiomas: Dict[str, Any] = axiomas_dict or {}
         self.estados: Dict[str, str] = {}
         self.moduladores: Dict[str, Dict[str, float]] = {}
 
+        # Snapshot em cache; _dirty marca que estados/moduladores mudaram
+        self._dirty = True
+        self._snapshot_cache: Optional[Dict[str, Any]] = None
+
         # Inicializa a FSM com axiomas, se já foram passados
         if self.axiomas:
             self.load_axiomas(self.axiomas)
         else:
             # Defaults de segurança caso ainda não haja axiomas carregados
-            self.estados.setdefault("A1", "A1_SAFE_FLOW")
-            self.estados.setdefault("A2", "A2_BASELINE")
+            self.estados = dict(self._DEFAULT_STATES)
 
         # Inicializa moduladores padrão
         self._ensure_default_moduladores()
@@ -55,21 +198,16 @@ class FSMAxiomas:
         Carrega/atualiza a definição dos axiomas e inicializa estados.
         """
         self.axiomas = axiomas_dict or {}
-        self.estados = {}
 
-        for ax_nome, ax_def in self.axiomas.items():
-            # Pulamos chaves que não são definições de axioma (ex. "descricao")
-            if not isinstance(ax_def, dict):
-                continue
-
-            fsm = ax_def.get("fsm", {})
-            initial_state = fsm.get("initial_state")
-            if initial_state:
-                self.estados[ax_nome] = initial_state
-
-        # Defaults de segurança caso algo não venha definido
-        self.estados.setdefault("A1", "A1_SAFE_FLOW")
-        self.estados.setdefault("A2", "A2_BASELINE")
+        # Pulamos chaves que não são definições de axioma (ex. "descricao");
+        # defaults de segurança cobrem o que não vier definido.
+        loaded = {
+            ax_nome: ax_def["fsm"]["initial_state"]
+            for ax_nome, ax_def in self.axiomas.items()
+            if isinstance(ax_def, dict) and (ax_def.get("fsm") or {}).get("initial_state")
+        }
+        self.estados = {**self._DEFAULT_STATES, **loaded}
+        self._dirty = True
 
         # Garantir moduladores padrão após recarregar axiomas
         self._ensure_default_moduladores()
@@ -81,8 +219,10 @@ class FSMAxiomas:
         """
         Garante que existam moduladores padrão para os axiomas críticos (A1, A2).
         """
-        self.moduladores.setdefault("A1", {"rigidez": 1.0, "sensibilidade": 1.0})
-        self.moduladores.setdefault("A2", {"rigidez": 1.0, "sensibilidade": 1.0})
+        for ax_nome, mods in self._DEFAULT_MODS.items():
+            if ax_nome not in self.moduladores:
+                self.moduladores[ax_nome] = dict(mods)
+                self._dirty = True
 
     def apply_civilizational_modulators(
         self,
@@ -106,44 +246,41 @@ class FSMAxiomas:
         - aprendizado de longo prazo,
         - curvas não-lineares, etc.
         """
-        stats = civilizational_stats.get("stats", {}) or {}
+        stats = civilizational_stats.get("stats") or {}
 
-        # Garante que os moduladores existam
+        # Garante que os moduladores existam: a partir daqui A1 e A2 estão
+        # sempre presentes e são ajustados no próprio dict, sem reatribuir.
         self._ensure_default_moduladores()
+        mods = self.moduladores
 
         # ------------------------------
         # Exemplo: ajustar A1 (preservação da vida)
         # ------------------------------
-        a1_mod = self.moduladores.get("A1", {})
+        a1_mod = mods["A1"]
         rigidez_a1 = a1_mod.get("rigidez", 1.0)
 
-        global_selfharm = stats.get("global_self_harm_risk", "low")
-        predicted_selfharm = prognostico_inicial.get("predicted_self_harm_risk", "low")
-
         # Se o risco global ou previsto for elevado -> aumenta rigidez de A1
-        if global_selfharm in ("medium", "high") or predicted_selfharm in ("medium", "high"):
-            rigidez_a1 = max(rigidez_a1, 1.2)
+        if (
+            stats.get("global_self_harm_risk", "low") in _NIVEIS_ALTOS
+            or prognostico_inicial.get("predicted_self_harm_risk", "low") in _NIVEIS_ALTOS
+        ):
+            a1_mod["rigidez"] = max(rigidez_a1, 1.2)
         else:
             # fallback suave para o default
-            rigidez_a1 = min(rigidez_a1, 1.0)
-
-        a1_mod["rigidez"] = rigidez_a1
-        self.moduladores["A1"] = a1_mod
+            a1_mod["rigidez"] = min(rigidez_a1, 1.0)
 
         # ------------------------------
         # Exemplo: ajustar A2 (verdade / não-delírio)
         # ------------------------------
-        a2_mod = self.moduladores.get("A2", {})
+        a2_mod = mods["A2"]
         sens_a2 = a2_mod.get("sensibilidade", 1.0)
 
-        misinformation_pressure = stats.get("misinformation_pressure", "low")
-        if misinformation_pressure in ("medium", "high"):
-            sens_a2 = max(sens_a2, 1.2)
+        if stats.get("misinformation_pressure", "low") in _NIVEIS_ALTOS:
+            a2_mod["sensibilidade"] = max(sens_a2, 1.2)
         else:
-            sens_a2 = min(sens_a2, 1.0)
+            a2_mod["sensibilidade"] = min(sens_a2, 1.0)
 
-        a2_mod["sensibilidade"] = sens_a2
-        self.moduladores["A2"] = a2_mod
+        self._dirty = True
 
         # No futuro, poderíamos imprimir logs detalhados aqui,
         # ou registrar esses ajustes no ledger.
@@ -162,10 +299,12 @@ class FSMAxiomas:
         if "A1" not in self.estados:
             print("[FSM_AXIOMAS] AVISO: A1 sem estado inicial. Aplicando default A1_SAFE_FLOW.")
             self.estados["A1"] = "A1_SAFE_FLOW"
+            self._dirty = True
 
         if "A2" not in self.estados:
             print("[FSM_AXIOMAS] AVISO: A2 sem estado inicial. Aplicando default A2_BASELINE.")
             self.estados["A2"] = "A2_BASELINE"
+            self._dirty = True
 
         self._ensure_default_moduladores()
 
@@ -188,6 +327,8 @@ class FSMAxiomas:
         if not session_memory:
             return
 
+        self._dirty = True
+
         fsm_states = session_memory.get("fsm_states")
         if isinstance(fsm_states, dict):
             for ax_nome, state in fsm_states.items():
@@ -214,6 +355,10 @@ class FSMAxiomas:
         Devolve um dicionário com o estado atual dos axiomas e moduladores,
         pronto para ser gravado no ledger.
 
+        O snapshot só é reconstruído quando estados/moduladores mudaram desde
+        a última chamada; caso contrário devolve o mesmo objeto em cache.
+        Trate o retorno como somente leitura.
+
         Ex:
             {
                 "fsm_states": { "A1": "A1_SAFE_FLOW", "A2": "A2_BASELINE", ... },
@@ -223,17 +368,20 @@ class FSMAxiomas:
                 }
             }
         """
-        return {
-            "fsm_states": dict(self.estados),
-            "fsm_modulators": {
-                ax: dict(mods) for ax, mods in self.moduladores.items()
-            },
-        }
+        if self._dirty or self._snapshot_cache is None:
+            self._snapshot_cache = {
+                "fsm_states": dict(self.estados),
+                "fsm_modulators": {
+                    ax: dict(mods) for ax, mods in self.moduladores.items()
+                },
+            }
+            self._dirty = False
+        return self._snapshot_cache
 
     # ------------------------------------------------------------------
     # Núcleo: processamento de eventos
     # ------------------------------------------------------------------
-    def process_events(self, eventos: Optional[List[str]], contexto: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    def process_events(self, eventos: Optional[Iterable[str]], contexto: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
         """
         Recebe lista de eventos do MIE + módulos de intenção vetorial
         e ajusta os estados dos axiomas.
@@ -248,11 +396,9 @@ class FSMAxiomas:
         Retorna um novo dicionário de estados.
         """
 
-        if eventos is None:
-            eventos = []
-
-        # Normaliza para garantir que são strings
-        eventos = [str(e) for e in eventos]
+        # Um único conjunto de strings para todos os testes de pertinência
+        # abaixo; set/frozenset do chamador são aproveitados sem cópia.
+        evset = _como_conjunto(eventos)
 
         new_states = dict(self.estados)
 
@@ -263,47 +409,72 @@ class FSMAxiomas:
         rigidez_a1 = a1_mod.get("rigidez", 1.0)
         sens_a2 = a2_mod.get("sensibilidade", 1.0)
 
+        mask_a1, mask_a2 = _mascaras(evset, rigidez_a1)
+
         # ------------------------------------------------------
         # A1 - preservação da vida (explícita + vetorial)
         # ------------------------------------------------------
-        eventos_risco_duro = [
-            "self_harm_flag", "chemistry_flag", "violence_flag",
-            "intent_selfharm_latent", "intent_chemistry_latent", "intent_extreme_scenario",
-        ]
+        prox_a1 = _A1_LUT[_A1_INDICE.get(new_states.get("A1"), _A1_OUTRO)][mask_a1]
+        if prox_a1 is not None:
+            new_states["A1"] = prox_a1
 
-        eventos_risco_suave = [
-            "risk_manipulacao", "risk_fracionado",
-        ]
+        # ------------------------------------------------------
+        # A2 - verdade / não-delírio / meta-consciência
+        # ------------------------------------------------------
+        # Alta sensibilidade → mais propenso a cair em UNCERTAINTY
+        prox_a2 = _A2_LUT[new_states.get("A2") == "A2_BASELINE"][mask_a2]
+        if prox_a2 is not None:
+            new_states["A2"] = prox_a2
 
-        if any(e in eventos for e in eventos_risco_duro):
-            # rigidez alta → cai direto em RISK
-            if rigidez_a1 >= 1.0:
-                new_states["A1"] = "A1_RISK"
-            else:
-                # Em um cenário hipoteticamente mais brando,
-                # poderíamos cair em QUERY, mas mantemos conservador.
-                new_states["A1"] = "A1_QUERY"
+        if new_states != self.estados:
+            self._dirty = True
+        self.estados = new_states
+        return new_states
 
-        elif any(e in eventos for e in eventos_risco_suave) and new_states.get("A1") == "A1_SAFE_FLOW":
-            new_states["A1"] = "A1_QUERY"
+    # ------------------------------------------------------------------
+    # Replay em lote (ex: histórico de eventos vindo do ledger)
+    # ------------------------------------------------------------------
+    def replay_events(self, historico: Iterable[Optional[Iterable[str]]]) -> Dict[str, str]:
+        """
+        Reaplica uma sequência de turnos (cada um uma lista de eventos) e
+        devolve os estados finais — equivalente a chamar process_events
+        turno a turno, mas mantendo A1/A2 em variáveis locais e só
+        materializando o dicionário de estados no fim.
+
+        Ex:
+            fsm.replay_events([
+                ["self_harm_flag"],
+                ["no_risk"],
+                ["meta_query_flag"],
+            ])
+        """
+        a1_mod = self.moduladores.get("A1", {"rigidez": 1.0, "sensibilidade": 1.0})
+        rigidez_a1 = a1_mod.get("rigidez", 1.0)
 
-        elif "ambiguity_high" in eventos and new_states.get("A1") == "A1_SAFE_FLOW":
-            new_states["A1"] = "A1_QUERY"
+        a1 = self.estados.get("A1")
+        a2 = self.estados.get("A2")
+        lut_a1 = _A1_LUT
+        lut_a2 = _A2_LUT
+        indice_a1 = _A1_INDICE
 
-        elif "no_risk" in eventos and new_states.get("A1") in ["A1_QUERY", "A1_RISK"]:
-            new_states["A1"] = "A1_SAFE_FLOW"
+        for eventos in historico:
+            mask_a1, mask_a2 = _mascaras(_como_conjunto(eventos), rigidez_a1)
 
-        # ------------------------------------------------------
-        # A2 - verdade / não-delírio / meta-consciência
-        # ------------------------------------------------------
-        # Alta sensibilidade → mais propenso a cair em UNCERTAINTY
-        if "meta_query_flag" in eventos or "ambiguity_high" in eventos:
-            # Se sensibilidade for maior que 1, podemos no futuro
-            # elevar para estados mais fortes (ex: DELIRIUM_RISK).
-            new_states["A2"] = "A2_UNCERTAINTY"
+            prox = lut_a1[indice_a1.get(a1, _A1_OUTRO)][mask_a1]
+            if prox is not None:
+                a1 = prox
+
+            prox = lut_a2[a2 == "A2_BASELINE"][mask_a2]
+            if prox is not None:
+                a2 = prox
 
-        elif "no_risk" in eventos and new_states.get("A2") != "A2_BASELINE":
-            new_states["A2"] = "A2_BASELINE"
+        new_states = dict(self.estados)
+        if a1 is not None:
+            new_states["A1"] = a1
+        if a2 is not None:
+            new_states["A2"] = a2
 
+        if new_states != self.estados:
+            self._dirty = True
         self.estados = new_states
         return new_states
@@ -1,13 +1,372 @@
 # engine/ledger_ops.py
 
+import atexit
+import mmap
 import os
 import json
-from datetime import datetime
-from typing import Any, Dict, Optional, List, Callable
+import tempfile
+import logging
+import threading
+import time
+import weakref
+from enum import IntEnum
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, Optional, List, Callable, Set, Tuple, Union
+
+# orjson é opcional: serializa/parseia o ledger bem mais rápido que o json
+# da stdlib e trabalha direto com bytes (sem decode/encode UTF-8 à parte).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_logger = logging.getLogger("ledger")
+_logger.addHandler(logging.NullHandler())
+
+
+LEDGER_VERSION = "aci4a_ledger_v0.2"
+INDEX_FILENAME = "odg_ledger_index.json"
+LOG_FILENAME = "odg_ledger_log.jsonl"
+
+# Linha do log que define códigos de flags dinâmicas: {"flag_def": {"<code>": {...}}}
+FLAG_DEF_KEY = "flag_def"
+
+
+def _read_json(path: str) -> Any:
+    """Lê e parseia um arquivo JSON (orjson se disponível)."""
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: Any, fsync: bool = False) -> None:
+    """
+    Grava um arquivo JSON indentado de forma atômica: serializa uma vez
+    para bytes (orjson se disponível), escreve num temporário exclusivo
+    ao lado e troca com os.replace — um leitor nunca vê o arquivo pela
+    metade, e dois escritores (outro processo, reset_lumin.py) não
+    compartilham o mesmo temporário.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+    pasta, nome = os.path.split(path)
+    fd, tmp = tempfile.mkstemp(prefix=nome + ".", suffix=".tmp", dir=pasta or ".")
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp, 0o644)  # mkstemp cria com 0o600
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _dumps_line(obj: Any) -> bytes:
+    """Serializa um registro como uma linha JSONL (bytes, com '\\n')."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _loads_line(line: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+# A partir deste tamanho o log é lido via mmap: o orjson parseia cada
+# linha direto da página mapeada, sem cópia para um buffer intermediário.
+# Abaixo disso, o custo de montar o mapeamento não compensa.
+_MMAP_MIN_BYTES = 1 << 20
+
+
+def _read_jsonl(path: str) -> List[Dict[str, Any]]:
+    """
+    Lê todas as linhas de um log JSONL.
+
+    Linhas vazias ou corrompidas (ex: escrita interrompida no meio) são
+    ignoradas em vez de invalidar o log inteiro.
+    """
+    registros: List[Dict[str, Any]] = []
+    try:
+        with open(path, "rb") as f:
+            if orjson is not None and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    _parse_jsonl_mmap(mm, registros)
+                return registros
+
+            registros.extend(_iter_jsonl_lines(f))
+    except FileNotFoundError:
+        pass
+    return registros
+
+
+def _iter_jsonl_lines(f: Any) -> Iterator[Dict[str, Any]]:
+    """Parseia, uma a uma, as linhas válidas de um log JSONL já aberto."""
+    for line in f:
+        if not line.strip():
+            continue
+        try:
+            yield _loads_line(line)
+        except ValueError:
+            continue
+
+
+def _iter_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Percorre um log JSONL em streaming: só uma linha parseada por vez
+    fica em memória.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        yield from _iter_jsonl_lines(f)
+
+
+def _parse_jsonl_mmap(mm: mmap.mmap, registros: List[Dict[str, Any]]) -> None:
+    """Parseia as linhas de um log mapeado em memória (requer orjson)."""
+    loads = orjson.loads
+    fim = len(mm)
+    with memoryview(mm) as view:
+        inicio = 0
+        while inicio < fim:
+            quebra = mm.find(b"\n", inicio)
+            if quebra == -1:
+                quebra = fim
+            if quebra > inicio:
+                try:
+                    registros.append(loads(view[inicio:quebra]))
+                except ValueError:
+                    pass
+            inicio = quebra + 1
+
+
+def _read_last_jsonl(path: str, bloco: int = 8192) -> Optional[Dict[str, Any]]:
+    """
+    Lê apenas o último registro válido de um log JSONL, varrendo o arquivo
+    de trás para frente em blocos — sem parsear o histórico inteiro.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+
+    with f:
+        pos = f.seek(0, os.SEEK_END)
+        resto = b""
+        while pos > 0:
+            ler = min(bloco, pos)
+            pos -= ler
+            f.seek(pos)
+            resto = f.read(ler) + resto
+            linhas = resto.split(b"\n")
+            # A primeira linha pode estar cortada no meio do bloco;
+            # só é confiável quando chegamos ao início do arquivo.
+            completas = linhas if pos == 0 else linhas[1:]
+            for line in reversed(completas):
+                if not line.strip():
+                    continue
+                try:
+                    return _loads_line(line)
+                except ValueError:
+                    continue
+            resto = linhas[0]
+    return None
+
+
+def _file_stamp(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, tamanho) do arquivo, ou None se ele não existir."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+# ----------------------------------------------------------------------
+# Empacotamento de interações (códigos inteiros no disco)
+# ----------------------------------------------------------------------
+class EstadoFSM(IntEnum):
+    """Códigos estáveis dos estados da FSM, usados em fsm_states no log."""
+    A1_ROOT = 1
+    A1_SAFE_FLOW = 2
+    A1_QUERY = 3
+    A1_RISK = 4
+    A1_OVERRIDE = 5
+    A2_BASELINE = 6
+    A2_UNCERTAINTY = 7
+    A2_CONTRADICTION = 8
+    A2_DELIRIUM_RISK = 9
+
+
+_ESTADO_POR_NOME = EstadoFSM.__members__
+
+
+def _pack_fsm_states(estados: Any) -> Any:
+    """
+    {"A1": "A1_SAFE_FLOW"} -> {"A1": 2}; na forma de lista,
+    "A1=A1_SAFE_FLOW" -> 2. Estados desconhecidos (ou que não pertencem
+    ao axioma da chave) ficam como estão.
+    """
+    if isinstance(estados, dict):
+        packed_dict: Dict[str, Any] = {}
+        for ax, nome in estados.items():
+            membro = _ESTADO_POR_NOME.get(nome) if isinstance(nome, str) else None
+            ok = membro is not None and isinstance(ax, str) and nome.startswith(ax + "_")
+            packed_dict[ax] = membro.value if ok else nome
+        return packed_dict
+    if not isinstance(estados, list):
+        return estados
+    packed: List[Any] = []
+    for item in estados:
+        if isinstance(item, str):
+            ax, sep, nome = item.partition("=")
+            membro = _ESTADO_POR_NOME.get(nome)
+            if sep and membro is not None and nome.startswith(ax + "_"):
+                packed.append(membro.value)
+                continue
+        packed.append(item)
+    return packed
+
+
+def _nome_estado(code: Any) -> Optional[str]:
+    if type(code) is int and code in EstadoFSM._value2member_map_:
+        return EstadoFSM(code).name
+    return None
+
+
+def _expand_fsm_states(estados: Any) -> Any:
+    if isinstance(estados, dict):
+        return {ax: _nome_estado(v) or v for ax, v in estados.items()}
+    if not isinstance(estados, list):
+        return estados
+    expanded: List[Any] = []
+    for item in estados:
+        nome = _nome_estado(item)
+        expanded.append(f"{nome.partition('_')[0]}={nome}" if nome else item)
+    return expanded
+
+
+def _pack_dynamic_flags(flags: Any, dicionario: Dict[str, Any]) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Reduz cada flag dinâmica ao seu `code`, registrando os metadados no
+    dicionário de flags (code -> metadados) na primeira vez que aparece.
+    Se os metadados divergirem do que já está registrado, a flag vai
+    inteira para o log. Retorna (flags empacotadas, definições novas) —
+    as novas precisam chegar ao log antes da linha que as usa.
+    """
+    novas: Dict[str, Any] = {}
+    if not isinstance(flags, list):
+        return flags, novas
+    packed: List[Any] = []
+    for flag in flags:
+        code = flag.get("code") if isinstance(flag, dict) else None
+        if type(code) is not int:
+            packed.append(flag)
+            continue
+        chave = str(code)
+        registrado = dicionario.get(chave)
+        if registrado is None:
+            dicionario[chave] = novas[chave] = dict(flag)
+        elif registrado != flag:
+            packed.append(flag)
+            continue
+        packed.append(code)
+    return packed, novas
+
+
+def expand_interaction(interaction: Dict[str, Any], flag_registry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Devolve a interação no formato completo (o mesmo de antes do
+    empacotamento): estados da FSM como "A1=A1_SAFE_FLOW" e flags
+    dinâmicas com todos os metadados, resolvidos via flag_registry
+    (code -> metadados). O dict original não é alterado.
+    """
+    out = dict(interaction)
+    if "fsm_states" in out:
+        out["fsm_states"] = _expand_fsm_states(out["fsm_states"])
+
+    mie = out.get("mie")
+    if isinstance(mie, dict) and isinstance(mie.get("dynamic_flags"), list):
+        mie = dict(mie)
+        mie["dynamic_flags"] = [
+            dict(flag_registry[str(f)]) if type(f) is int and str(f) in flag_registry else f
+            for f in mie["dynamic_flags"]
+        ]
+        out["mie"] = mie
+    return out
+
+
+def _eh_flag_def(registro: Any) -> bool:
+    return isinstance(registro, dict) and FLAG_DEF_KEY in registro
+
+
+def _expandir_log(registros: Iterable[Any], base: Optional[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Expande, na ordem do log, as interações de uma sequência de linhas.
+
+    As linhas {"flag_def": ...} atualizam o dicionário de flags à medida
+    que aparecem (cada definição vem antes da primeira linha que a usa) e
+    não são devolvidas. `base` é o flag_dictionary do cabeçalho: só uma
+    dica — ledgers antigos guardavam as definições apenas lá.
+    """
+    registry = dict(base) if isinstance(base, dict) else {}
+    for registro in registros:
+        if _eh_flag_def(registro):
+            defs = registro[FLAG_DEF_KEY]
+            if isinstance(defs, dict):
+                registry.update(defs)
+            continue
+        yield expand_interaction(registro, registry)
+
+
+# Prefixo "YYYY-MM-DDTHH:MM:SS" do último segundo formatado. Várias
+# chamadas no mesmo segundo (interação + cabeçalho) só montam os micros.
+_ISO_SEGUNDO: Tuple[int, str] = (-1, "")
 
 
 def _now_iso() -> str:
-    return datetime.utcnow().isoformat() + "Z"
+    """Timestamp UTC ISO-8601 com microssegundos e sufixo Z."""
+    global _ISO_SEGUNDO
+    seg, resto = divmod(time.time_ns(), 1_000_000_000)
+    cache = _ISO_SEGUNDO
+    if cache[0] != seg:
+        cache = (seg, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seg)))
+        _ISO_SEGUNDO = cache
+    return f"{cache[1]}.{resto // 1000:06d}Z"
+
+
+# Ledgers ainda abertos. Um único hook de atexit fecha todos; o WeakSet
+# não prende a instância (nem seus buffers) até o fim do processo.
+_LEDGERS_ABERTOS: "weakref.WeakSet[LedgerManager]" = weakref.WeakSet()
+
+
+def _fechar_ledgers_abertos() -> None:
+    for ledger in list(_LEDGERS_ABERTOS):
+        try:
+            ledger.close()
+        except Exception:
+            _logger.exception("[LEDGER] falha ao fechar %s no encerramento", ledger.ledger_dir)
+
+
+atexit.register(_fechar_ledgers_abertos)
 
 
 class LedgerManager:
@@ -23,40 +382,52 @@ class LedgerManager:
         • callback para receber payload estruturado do MIE
         • armazenar 'intent_vector' + flags dinâmicas por interação
 
-    Estrutura básica do arquivo odg_ledger_index.json:
+    O ledger fica em dois arquivos dentro de ledger/:
+
+    odg_ledger_index.json — cabeçalho pequeno, reescrito a cada flush
+    (flag_dictionary aqui é só uma cópia do que já está no log):
 
     {
-      "version": "aci4a_ledger_v0.1",
+      "version": "aci4a_ledger_v0.2",
       "owner": "Lumin",
       "created_at": "...",
       "updated_at": "...",
       "total_interactions": 0,
-      "interactions": [
-        {
-          "ts": "...",
-          "user_msg": "...",
-          "draft": "...",
-          "final": "...",
-          "fsm_states": [...],
-          "fsm_snapshot": {...},
-          "eventos": [...],
-          "prognostico": {...},
-          "civilizational_context": {...},
-          "mie": {
-            "lexical_events": [...],
-            "dynamic_flags": [...],
-            "intent_vector": {...}
-          }
-        },
-        ...
-      ]
+      "flag_dictionary": {"<code>": {metadados da flag}, ...}
     }
 
+    odg_ledger_log.jsonl — log append-only, uma interação por linha:
+
+        {"ts": "...", "user_msg": "...", "draft": "...", "final": "...",
+         "fsm_states": [...], "fsm_snapshot": {...}, "eventos": [...],
+         "prognostico": {...}, "civilizational_context": {...},
+         "mie": {"lexical_events": [...], "dynamic_flags": [...],
+                 "intent_vector": {...}}}
+
+    No log, fsm_states usa os códigos de EstadoFSM e dynamic_flags só o
+    `code` de cada flag. Os metadados de cada code ficam no próprio log,
+    numa linha {"flag_def": {"<code>": {...}}} gravada antes da primeira
+    interação que o usa — o log se decodifica sozinho, mesmo se o
+    cabeçalho se perder. A leitura (get_all_interactions,
+    load_for_session, ...) devolve o formato completo via _expandir_log.
+
+    Registrar uma interação só acrescenta uma linha ao log (custo O(1)),
+    em vez de reescrever todo o histórico. Ledgers v0.1 (interações
+    dentro do próprio index) são migrados para o log na primeira abertura.
+
     Rotação, agregações civilizatórias e análises mais complexas
     ficam para versões futuras (v0.2+).
     """
 
-    def __init__(self, base_dir: str, owner: str = "Lumin"):
+    CURRENT_VERSION = LEDGER_VERSION
+
+    def __init__(
+        self,
+        base_dir: str,
+        owner: str = "Lumin",
+        batch_size: int = 32,
+        max_interval_s: float = 2.0,
+    ):
         self.base_dir = base_dir
         self.owner = owner
 
@@ -64,15 +435,57 @@ class LedgerManager:
         self.ledger_dir = os.path.join(self.base_dir, "ledger")
         os.makedirs(self.ledger_dir, exist_ok=True)
 
-        # Caminho do arquivo principal do ledger
-        self.index_path = os.path.join(self.ledger_dir, "odg_ledger_index.json")
+        # Cabeçalho (metadados) e log de interações
+        self.index_path = os.path.join(self.ledger_dir, INDEX_FILENAME)
+        self.log_path = os.path.join(self.ledger_dir, LOG_FILENAME)
 
         # Payload mais recente vindo do MIE (via callback)
         self._last_mie_payload: Optional[Dict[str, Any]] = None
 
+        # Buffer de escrita: interações já serializadas, ainda não gravadas.
+        # Vai para o disco (com fsync) a cada batch_size interações ou
+        # quando max_interval_s passa desde o último flush — o que vier
+        # primeiro. flush() força a gravação; close() roda no atexit.
+        #
+        # A gravação periódica roda numa thread escritora (criada no
+        # primeiro registro): o turno só serializa a linha no buffer e
+        # não espera write/fsync. O lock serializa buffer, cache e
+        # arquivos entre a escritora e as chamadas públicas. close()
+        # encerra a escritora e faz o flush final.
+        self.batch_size = batch_size
+        self.max_interval_s = max_interval_s
+        self._pending: List[bytes] = []
+        self._last_flush_ts = time.monotonic()
+        self._lock = threading.RLock()
+        self._acordar_escritor = threading.Event()
+        self._escritor: Optional[threading.Thread] = None
+        self._fechado = False  # close(): escritora parada, gravação síncrona
+        _LEDGERS_ABERTOS.add(self)
+
+        # Visão em memória do que está em disco. Este LedgerManager é o
+        # único escritor: cabeçalho e interações são parseados uma vez e
+        # mantidos atualizados a cada flush. O carimbo (mtime_ns, tamanho)
+        # de cada arquivo detecta alteração por outro processo -> releitura.
+        self._header: Optional[Dict[str, Any]] = None
+        self._header_stamp: Optional[Tuple[int, int]] = None
+        self._interactions: Optional[List[Dict[str, Any]]] = None
+        self._log_stamp: Optional[Tuple[int, int]] = None
+
         # Garante que o arquivo exista (ou seja criado do zero)
         self._ensure_index_file()
 
+        # Contador de interações (incluindo as pendentes). O arquivo só é
+        # consultado aqui, na abertura; depois o contador é a fonte.
+        header = self._load_header()
+        self._total: int = header["total_interactions"]
+
+        # Flags (code -> metadados) já definidas no log ou no buffer. Parte
+        # da cópia do cabeçalho; se ela se perdeu, as definições são só
+        # regravadas no log (duplicatas são inofensivas).
+        registry = header.get("flag_dictionary")
+        self._flag_defs: Dict[str, Any] = dict(registry) if isinstance(registry, dict) else {}
+        self._defs_no_buffer: Set[str] = set()  # codes cuja definição ainda está em _pending
+
     # ------------------------------------------------------------------
     # Integração com o MIE Guardião (callback)
     # ------------------------------------------------------------------
@@ -111,11 +524,12 @@ class LedgerManager:
         user_msg: str,
         draft: str,
         resposta_final: str,
-        estados_axiomas: Optional[List[str]] = None,
+        estados_axiomas: Optional[Union[Mapping[str, str], List[str]]] = None,
         fsm_snapshot: Optional[Dict[str, Any]] = None,
         eventos: Optional[List[str]] = None,
         prognostico: Optional[Dict[str, Any]] = None,
         civilizational_context: Optional[Dict[str, Any]] = None,
+        durable: bool = False,
     ) -> None:
         """
         Registra uma interação completa no ledger.
@@ -133,29 +547,32 @@ class LedgerManager:
                 civilizational_context=self.civilizational_stats,
             )
 
+        estados_axiomas pode vir como mapeamento {"A1": "A1_SAFE_FLOW", ...}
+        (o retorno de FSMAxiomas.process_events) ou como lista
+        "A1=A1_SAFE_FLOW"; nos dois casos é gravado como EstadoFSM.
+
         Integra, se disponível, o último payload recebido do MIE via
         self.mie_callback().
-        """
-        data = self._load_index()
-
-        # Garantia extra em cima do _load_index (robustez)
-        if "interactions" not in data or not isinstance(data["interactions"], list):
-            data["interactions"] = []
-        if "total_interactions" not in data or not isinstance(data["total_interactions"], int):
-            data["total_interactions"] = len(data["interactions"])
 
+        A interação entra no buffer de escrita; durable=True grava e faz
+        fsync imediatamente (junto com o que estiver pendente).
+        """
         interaction: Dict[str, Any] = {
             "ts": _now_iso(),
             "user_msg": user_msg,
             "draft": draft,
             "final": resposta_final,
-            "fsm_states": estados_axiomas or [],
+            "fsm_states": dict(estados_axiomas) if isinstance(estados_axiomas, Mapping) else (estados_axiomas or []),
             "fsm_snapshot": fsm_snapshot or {},
             "eventos": eventos or [],
             "prognostico": prognostico or {},
             "civilizational_context": civilizational_context or {},
         }
 
+        with self._lock:
+            self._registrar(interaction, durable)
+
+    def _registrar(self, interaction: Dict[str, Any], durable: bool) -> None:
         # Se o MIE tiver observado algo nesta janela, agregamos
         if self._last_mie_payload is not None:
             mie_payload = self._last_mie_payload
@@ -167,93 +584,345 @@ class LedgerManager:
                 "intent_vector": mie_payload.get("intent_vector", {}),
             }
 
-        data["interactions"].append(interaction)
-        data["total_interactions"] = data.get("total_interactions", 0) + 1
-        data["updated_at"] = _now_iso()
+        packed, novas = self._pack_interaction(interaction)
+        if novas:
+            # No mesmo lote (mesmo write) e antes da linha que as usa
+            self._pending.append(_dumps_line({FLAG_DEF_KEY: novas}))
+            self._defs_no_buffer.update(novas)
+        self._pending.append(_dumps_line(packed))
+        self._total += 1
+
+        if durable or self._fechado:
+            self._write_pending(fsync=True)
+            return
+
+        if self._escritor is None:
+            self._escritor = threading.Thread(
+                target=self._loop_escritor, name="ledger-escritor", daemon=True
+            )
+            self._escritor.start()
+        if (
+            len(self._pending) >= self.batch_size
+            or time.monotonic() - self._last_flush_ts >= self.max_interval_s
+        ):
+            self._acordar_escritor.set()
+
+    def _loop_escritor(self) -> None:
+        """
+        Thread escritora: grava o buffer quando acordada (lote cheio ou
+        intervalo vencido num registro) ou, sem novos registros, a cada
+        max_interval_s — nada fica parado no buffer até o atexit.
+        """
+        while True:
+            self._acordar_escritor.wait(self.max_interval_s)
+            self._acordar_escritor.clear()
+            if self._fechado:
+                return  # close() faz o flush final
+            try:
+                self.flush()
+            except Exception:
+                # Disco cheio / sem permissão: o lote continua no buffer
+                # (_write_pending só o esvazia após gravar) e o próximo
+                # ciclo tenta de novo
+                _logger.exception(
+                    "[LEDGER] falha ao gravar %d interação(ões) pendente(s); nova tentativa em %.1fs",
+                    len(self._pending), self.max_interval_s,
+                )
+
+    def flush(self) -> None:
+        """Grava as interações pendentes no log, com fsync."""
+        with self._lock:
+            self._write_pending(fsync=True)
+
+    def close(self) -> None:
+        """
+        Para a thread escritora (se houver) e grava o que restar no buffer.
+        Pode ser chamado mais de uma vez; registros feitos depois do close()
+        são gravados na hora, com fsync, sem recriar a escritora.
+        """
+        _LEDGERS_ABERTOS.discard(self)
+        with self._lock:
+            self._fechado = True
+            escritor, self._escritor = self._escritor, None
+        if escritor is not None:
+            # Fora do lock: a escritora pode estar no meio de um flush()
+            self._acordar_escritor.set()
+            escritor.join()
+        self.flush()
+
+    def _pack_interaction(self, interaction: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Forma compacta gravada no log: estados da FSM como EstadoFSM e
+        flags dinâmicas como `code`. Retorna (interação, definições de
+        flags novas); quem chama grava as definições antes da interação.
+        """
+        packed = dict(interaction)
+        packed["fsm_states"] = _pack_fsm_states(interaction["fsm_states"])
+
+        novas: Dict[str, Any] = {}
+        mie = interaction.get("mie")
+        if mie is not None:
+            flags, novas = _pack_dynamic_flags(mie.get("dynamic_flags"), self._flag_defs)
+            packed["mie"] = {**mie, "dynamic_flags": flags}
+        return packed, novas
 
-        self._save_index(data)
+    def _flag_registry(self) -> Optional[Dict[str, Any]]:
+        """Cópia do dicionário de flags no cabeçalho (base de _expandir_log)."""
+        return self._load_header().get("flag_dictionary")
 
     # ------------------------------------------------------------------
     # API de consulta simples (para futuras camadas)
     # ------------------------------------------------------------------
     def get_all_interactions(self) -> List[Dict[str, Any]]:
         """Retorna a lista de interações armazenadas."""
-        data = self._load_index()
-        return data.get("interactions", [])
+        with self._lock:
+            self._write_pending(fsync=False)
+            registry = self._flag_registry()
+            interacoes = list(self._cached_interactions())
+        return list(_expandir_log(interacoes, registry))
+
+    def iter_interactions(self) -> Iterator[Dict[str, Any]]:
+        """
+        Itera sobre as interações em ordem, sem montar a lista inteira.
+
+        Se a visão em memória já estiver carregada, itera sobre ela;
+        senão, lê o log em streaming, linha a linha.
+        """
+        with self._lock:
+            self._write_pending(fsync=False)
+            registry = self._flag_registry()
+            if self._interactions is not None and self._log_stamp == _file_stamp(self.log_path):
+                fonte: Iterator[Dict[str, Any]] = iter(list(self._interactions))
+            else:
+                fonte = _iter_jsonl(self.log_path)
+        return _expandir_log(fonte, registry)
 
     def get_last_interaction(self) -> Optional[Dict[str, Any]]:
-        """Retorna a última interação registrada, se existir."""
-        interactions = self.get_all_interactions()
-        if not interactions:
-            return None
-        return interactions[-1]
+        """
+        Retorna a última interação registrada, se existir.
+        Lê só o fim do log, sem carregar o histórico inteiro.
+        """
+        with self._lock:
+            self._write_pending(fsync=False)
+            if self._interactions is not None and self._log_stamp == _file_stamp(self.log_path):
+                last = self._interactions[-1] if self._interactions else None
+            else:
+                last = _read_last_jsonl(self.log_path)
+            if last is None:
+                return None
+            # Toda definição gravada por este ledger está em _flag_defs
+            if not (_eh_flag_def(last) or self._faltam_flags(last)):
+                return expand_interaction(last, self._flag_defs)
+
+        # Code definido por outro escritor: só o log inteiro resolve
+        ultima = None
+        for ultima in self.iter_interactions():
+            pass
+        return ultima
+
+    def _faltam_flags(self, interaction: Dict[str, Any]) -> bool:
+        mie = interaction.get("mie")
+        flags = mie.get("dynamic_flags") if isinstance(mie, dict) else None
+        if not isinstance(flags, list):
+            return False
+        return any(type(f) is int and str(f) not in self._flag_defs for f in flags)
 
     # ------------------------------------------------------------------
-    # Infra de arquivo JSON
+    # Infra de arquivos (cabeçalho JSON + log JSONL)
     # ------------------------------------------------------------------
+    def _new_header(self) -> Dict[str, Any]:
+        agora = _now_iso()
+        return {
+            "version": LEDGER_VERSION,
+            "owner": self.owner,
+            "created_at": agora,
+            "updated_at": agora,
+            "total_interactions": 0,
+        }
+
     def _ensure_index_file(self) -> None:
         """
-        Garante que o arquivo principal exista com estrutura mínima.
-        Não sobrescreve se já existir.
+        Garante que o cabeçalho exista com estrutura mínima.
+        Não sobrescreve se já existir; se for um ledger v0.1 (interações
+        dentro do index), migra as interações para o log JSONL.
         """
         if not os.path.exists(self.index_path):
-            initial = {
-                "version": "aci4a_ledger_v0.1",
-                "owner": self.owner,
-                "created_at": _now_iso(),
-                "updated_at": _now_iso(),
-                "total_interactions": 0,
-                "interactions": [],
-            }
-            self._save_index(initial)
+            self._save_header(self._new_header())
+            return
 
-    def _load_index(self) -> Dict[str, Any]:
+        try:
+            data = _read_json(self.index_path)
+        except Exception:
+            return
+
+        if isinstance(data, dict) and isinstance(data.get("interactions"), list):
+            self._migrate_v01(data)
+
+    def _migrate_v01(self, data: Dict[str, Any]) -> None:
         """
-        Carrega o índice do ledger e faz MIGRAÇÃO leve caso o formato
-        seja antigo ou esteja incompleto.
+        Migração única v0.1 -> v0.2: move a lista "interactions" do index
+        para o log JSONL e reescreve o index só com o cabeçalho.
         """
-        if not os.path.exists(self.index_path):
-            self._ensure_index_file()
+        interactions = data.pop("interactions")
+        if interactions:
+            with open(self.log_path, "ab") as f:
+                f.write(b"".join(_dumps_line(i) for i in interactions))
 
-        try:
-            with open(self.index_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            # Em caso de corrupção, recomeça (v0.1 simples)
-            return {
-                "version": "aci4a_ledger_v0.1",
-                "owner": self.owner,
-                "created_at": _now_iso(),
-                "updated_at": _now_iso(),
-                "total_interactions": 0,
-                "interactions": [],
-            }
+        if not isinstance(data.get("total_interactions"), int):
+            data["total_interactions"] = len(interactions)
+        data["version"] = LEDGER_VERSION
+        self._save_header(self._normalize_header(data), fsync=True)
 
+    def _normalize_header(self, data: Any) -> Dict[str, Any]:
+        """
+        Cabeçalhos gravados por esta versão já estão completos: uma
+        comparação de versão basta. Os demais passam por _migrate_header.
+        """
+        if (
+            isinstance(data, dict)
+            and data.get("version") == self.CURRENT_VERSION
+            and isinstance(data.get("total_interactions"), int)
+        ):
+            return data
+        return self._migrate_header(data)
+
+    def _migrate_header(self, data: Any) -> Dict[str, Any]:
+        """
+        Normalização leve do cabeçalho (campos ausentes ou formato antigo).
+        """
         # Se por algum motivo não for dict, reseta
         if not isinstance(data, dict):
             data = {}
 
-        # MIGRAÇÃO / NORMALIZAÇÃO
         if "version" not in data:
-            data["version"] = "aci4a_ledger_v0.1"
+            data["version"] = LEDGER_VERSION
         if "owner" not in data:
             data["owner"] = self.owner
-        if "created_at" not in data:
-            data["created_at"] = _now_iso()
-        if "updated_at" not in data:
-            data["updated_at"] = _now_iso()
-        if "interactions" not in data or not isinstance(data.get("interactions"), list):
-            # Ledger antigo sem campo interactions → cria lista vazia
-            data["interactions"] = []
+        if "created_at" not in data or "updated_at" not in data:
+            agora = _now_iso()
+            data.setdefault("created_at", agora)
+            data.setdefault("updated_at", agora)
         if "total_interactions" not in data or not isinstance(data.get("total_interactions"), int):
-            data["total_interactions"] = len(data["interactions"])
+            data["total_interactions"] = sum(
+                1 for r in _iter_jsonl(self.log_path) if not _eh_flag_def(r)
+            )
+
+        return data
+
+    def _load_header(self) -> Dict[str, Any]:
+        """
+        Cabeçalho do ledger (sem as interações). Servido da memória
+        enquanto o arquivo não for alterado por fora.
+        """
+        stamp = _file_stamp(self.index_path)
+        if stamp is None:
+            self._ensure_index_file()
+            stamp = _file_stamp(self.index_path)
+        if self._header is not None and stamp == self._header_stamp:
+            return self._header
+
+        try:
+            data = self._normalize_header(_read_json(self.index_path))
+        except Exception:
+            # Em caso de corrupção, recomeça o cabeçalho (o log é preservado)
+            data = self._normalize_header({})
 
+        self._header = data
+        self._header_stamp = stamp
+        return data
+
+    def _cached_interactions(self) -> List[Dict[str, Any]]:
+        """Interações do log, parseadas só quando o arquivo mudou por fora."""
+        stamp = _file_stamp(self.log_path)
+        if self._interactions is None or stamp != self._log_stamp:
+            self._interactions = _read_jsonl(self.log_path)
+            self._log_stamp = stamp
+        return self._interactions
+
+    def _load_index(self) -> Dict[str, Any]:
+        """
+        Visão completa no formato v0.1: cabeçalho + lista "interactions"
+        reconstruída a partir do log.
+        """
+        with self._lock:
+            self._write_pending(fsync=False)
+            data = dict(self._load_header())
+            registry = self._flag_registry()
+            interacoes = list(self._cached_interactions())
+        data["interactions"] = list(_expandir_log(interacoes, registry))
         return data
 
-    def _save_index(self, data: Dict[str, Any]) -> None:
+    def _save_header(self, data: Dict[str, Any], fsync: bool = False) -> None:
         os.makedirs(self.ledger_dir, exist_ok=True)
-        with open(self.index_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        _write_json(self.index_path, data, fsync=fsync)
+        self._header = data
+        self._header_stamp = _file_stamp(self.index_path)
+
+    def _write_pending(self, fsync: bool) -> None:
+        """
+        Descarrega o buffer no log num único write() e atualiza o
+        cabeçalho. Leituras chamam com fsync=False: veem o que foi
+        registrado sem pagar o custo de durabilidade.
+        """
+        if not self._pending:
+            return
+
+        pending = self._pending
+        agora = _now_iso()  # um único updated_at por flush, não por interação
+        os.makedirs(self.ledger_dir, exist_ok=True)
+
+        header = self._load_header()
+        cache_em_dia = (
+            self._interactions is not None
+            and self._log_stamp == _file_stamp(self.log_path)
+        )
+        # O buffer só é esvaziado depois que write (e fsync) deram certo.
+        # Em falha (disco cheio, sem permissão) o log volta ao tamanho
+        # anterior — sem linha pela metade — e o lote fica no buffer para
+        # o próximo flush.
+        fd = os.open(self.log_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        linhas = pending
+        try:
+            inicio = os.lseek(fd, 0, os.SEEK_END)
+            if inicio == 0:
+                # Log novo (apagado por fora, ou cabeçalho herdado): abre
+                # com as definições de lotes anteriores, que as linhas do
+                # lote podem usar
+                anteriores = {
+                    k: v for k, v in self._flag_defs.items() if k not in self._defs_no_buffer
+                }
+                if anteriores:
+                    linhas = [_dumps_line({FLAG_DEF_KEY: anteriores})] + pending
+            try:
+                view = memoryview(b"".join(linhas))
+                while view:
+                    view = view[os.write(fd, view):]
+                if fsync:
+                    os.fsync(fd)
+            except OSError:
+                try:
+                    os.ftruncate(fd, inicio)
+                except OSError:
+                    pass
+                raise
+        finally:
+            os.close(fd)
+        self._pending = []
+        self._defs_no_buffer.clear()
+
+        # Mantém a visão em memória: só as linhas novas são parseadas
+        if cache_em_dia:
+            self._interactions.extend(_loads_line(line) for line in linhas)
+            self._log_stamp = _file_stamp(self.log_path)
+        else:
+            self._interactions = None
+
+        header["total_interactions"] = self._total
+        header["updated_at"] = agora
+        if self._flag_defs:
+            header["flag_dictionary"] = dict(self._flag_defs)
+        self._save_header(header, fsync=fsync)
+        self._last_flush_ts = time.monotonic()
 
 
 # ----------------------------------------------------------------------
@@ -263,22 +932,26 @@ def read_ledger_index_data(base_dir: str) -> Optional[Dict[str, Any]]:
     """
     Lê diretamente o odg_ledger_index.json se existir.
 
-    Usado como base para carregar memória simbólica de sessão.
+    Usado como base para carregar memória simbólica de sessão. Em ledgers
+    v0.2 as interações vêm do log JSONL e são devolvidas em "interactions",
+    no mesmo formato de antes.
     """
     ledger_dir = os.path.join(base_dir, "ledger")
-    index_path = os.path.join(ledger_dir, "odg_ledger_index.json")
+    index_path = os.path.join(ledger_dir, INDEX_FILENAME)
 
     if not os.path.exists(index_path):
         return None
 
     try:
-        with open(index_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(index_path)
         # Pequena normalização para consumo pela camada 0
         if not isinstance(data, dict):
             return None
         if "interactions" not in data or not isinstance(data["interactions"], list):
-            data["interactions"] = []
+            data["interactions"] = list(_expandir_log(
+                _read_jsonl(os.path.join(ledger_dir, LOG_FILENAME)),
+                data.get("flag_dictionary"),
+            ))
         return data
     except Exception:
         return None
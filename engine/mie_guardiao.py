@@ -1,9 +1,31 @@
 # engine/mie_guardiao.py
 
+import os
 import re
+import sys
 import json
 import glob
-from typing import List, Dict, Any, Callable, Optional
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterable, Optional, Set, Tuple
+
+# orjson é opcional: parse dos arquivos de flags mais rápido que o json
+# da stdlib.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# pyahocorasick é opcional: autômato Aho-Corasick em C que acha todos os
+# padrões de uma vez, numa única varredura do texto. Usado pelo FlagLoader
+# e pelo léxico interno do MIEGuardiao; sem ele, o FlagLoader usa um
+# índice de trigramas (stdlib) e o léxico, uma varredura de substrings.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+from engine.texto import dobrar_acentos
 
 
 # ================================================================
@@ -18,9 +40,9 @@ def _normalize(text: str) -> str:
     """
     if not text:
         return ""
-    text = text.lower()
-    text = re.sub(r"\s+", " ", text)
-    return text.strip()
+    # split() sem argumento já quebra em qualquer sequência de espaços
+    # Unicode (mesmo conjunto do \s do re) e descarta as pontas, em C.
+    return " ".join(text.lower().split())
 
 
 def _contains_any(text: str, patterns: List[str]) -> bool:
@@ -28,6 +50,157 @@ def _contains_any(text: str, patterns: List[str]) -> bool:
     return any(p in text for p in patterns)
 
 
+_REGEX_FLAGS = re.IGNORECASE | re.MULTILINE
+
+# Eventos léxicos emitidos pelo MIEGuardiao. Internados: comparações
+# e buscas em set/dict por esses nomes ficam na igualdade por ponteiro.
+EV_SELF_HARM_FIGURATIVE = sys.intern("self_harm_figurative")
+EV_SELF_HARM = sys.intern("self_harm_flag")
+EV_EMOTION_ELEVATED = sys.intern("emotion_elevated")
+EV_EMOTION_HIGH = sys.intern("emotion_high")
+EV_CHEMISTRY = sys.intern("chemistry_flag")
+EV_RISK_MANIPULACAO = sys.intern("risk_manipulacao")
+EV_RISK_FRACIONADO = sys.intern("risk_fracionado")
+EV_VIOLENCE_FIGURATIVE = sys.intern("violence_figurative")
+EV_VIOLENCE = sys.intern("violence_flag")
+EV_DEPENDENCY = sys.intern("dependency_flag")
+EV_OVERTRUST = sys.intern("overtrust_flag")
+EV_META_QUERY = sys.intern("meta_query_flag")
+EV_AMBIGUITY_HIGH = sys.intern("ambiguity_high")
+EV_NO_RISK = sys.intern("no_risk")
+
+# Ordem das severidades (para max_severity do vetor de intenção):
+# nome -> posição, e posição -> nome.
+_SEVERIDADES: Tuple[str, ...] = ("none", "low", "medium", "high", "critical")
+_SEVERIDADE_RANK: Dict[str, int] = {s: i for i, s in enumerate(_SEVERIDADES)}
+
+# Listas do léxico interno do MIEGuardiao (nomes dos atributos). Cada
+# uma é uma categoria no matcher combinado de _analisar_lexico.
+_CATEGORIAS_LEXICO: Tuple[str, ...] = (
+    "selfharm_exp",
+    "selfharm_impl",
+    "selfharm_figurativo",
+    "emocao_leve",
+    "emocao_forte",
+    "violencia_literal",
+    "violencia_ambigua",
+    "violencia_figurativa",
+    "verbo_manip",
+    "objetos_risco",
+    "fracionamento",
+    "quimica_hard",
+    "meta_query",
+    "dependencia",
+    "overtrust",
+)
+
+# Construções que mudam de sentido (ou não compilam) quando o regex é
+# embutido numa alternação maior: backreferences numeradas/nomeadas,
+# condicionais por grupo, grupos nomeados (nomes podem colidir) e
+# flags inline globais.
+_NAO_COMBINAVEL = re.compile(r"\\[1-9]|\(\?P[<=]|\(\?\(|\(\?[aiLmsux]+\)")
+
+
+# ================================================================
+# Leitura de arquivos de flags
+# ================================================================
+def _read_flags_file(path: str) -> Any:
+    """Lê e parseia um arquivo de flags; None se ilegível ou inválido."""
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+        if orjson is not None:
+            return orjson.loads(raw)
+        return json.loads(raw.decode("utf-8"))
+    except Exception:
+        return None
+
+
+# ================================================================
+# Preparação de cada flag (no carregamento)
+# ================================================================
+# Regexes compilados e padrões normalizados são imutáveis: ficam
+# compartilhados entre todos os FlagLoader do processo (testes, várias
+# sessões), e recarregar as mesmas flags não recompila nada.
+_REGEX_CACHE: Dict[Tuple[str, int], "re.Pattern[str]"] = {}
+_NORM_CACHE: Dict[str, str] = {}
+
+
+def _prepare_flag(flag: Dict[str, Any]) -> None:
+    """
+    Normaliza campos e compila regexes.
+
+    Padrões normalizados e regexes compilados ficam em tuplas: são
+    montados uma vez no carregamento e nunca alterados depois.
+    """
+    get = flag.get
+    norm_cache = _NORM_CACHE
+    regex_cache = _REGEX_CACHE
+
+    # Normalizar patterns_any
+    patterns_norm = []
+    for p in get("patterns_any") or ():
+        n = norm_cache.get(p)
+        if n is None:
+            n = norm_cache.setdefault(p, _normalize(p))
+        patterns_norm.append(n)
+    flag["_patterns_any_norm"] = tuple(patterns_norm)
+
+    # Compilar regex_any, se houver
+    compiled_regexes = []
+    for pattern in get("regex_any") or ():
+        chave = (pattern, _REGEX_FLAGS)
+        compiled = regex_cache.get(chave)
+        if compiled is None:
+            try:
+                compiled = regex_cache.setdefault(chave, re.compile(pattern, _REGEX_FLAGS))
+            except re.error:
+                continue
+        compiled_regexes.append(compiled)
+    flag["_regex_compiled"] = tuple(compiled_regexes)
+
+    # Normalizar metadados principais
+    flag["id"] = str(get("id", "")).strip()
+    flag["category"] = str(get("category", "")).strip()
+    flag["severity"] = str(get("severity", "")).strip()
+    flag["intent_type"] = str(get("intent_type", "")).strip()
+    flag["event_tags"] = get("event_tags") or []
+
+    # Registro público (o que vai em dynamic_flags), montado uma vez aqui
+    flag["_registro"] = _registro_publico(flag)
+
+
+def _registro_publico(flag: Dict[str, Any]) -> Dict[str, Any]:
+    """Campos de uma flag expostos no payload do MIE (dynamic_flags)."""
+    get = flag.get
+    return {
+        "id": get("id"),
+        "code": get("code"),
+        "category": get("category"),
+        "severity": get("severity"),
+        "intent_type": get("intent_type"),
+        "event_tags": get("event_tags") or [],
+    }
+
+
+def _copiar_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Cópia de um payload de analisar_estruturado que não compartilha
+    listas nem dicts com o original (que fica no cache LRU): quem recebe
+    pode mexer à vontade sem mudar a próxima resposta igual.
+    """
+    intent = dict(payload["intent_vector"])
+    intent["categories"] = dict(intent["categories"])
+    intent["severities"] = dict(intent["severities"])
+    result = dict(payload)
+    result["lexical_events"] = list(payload["lexical_events"])
+    result["dynamic_flags"] = [
+        {**f, "event_tags": list(f["event_tags"])} for f in payload["dynamic_flags"]
+    ]
+    result["intent_vector"] = intent
+    return result
+
+
 # ================================================================
 # Loader de flags dinâmicas (JSON)
 # ================================================================
@@ -65,6 +238,26 @@ class FlagLoader:
         self.by_severity: Dict[str, List[Dict[str, Any]]] = {}
         self.by_intent_type: Dict[str, List[Dict[str, Any]]] = {}
 
+        # Índice de padrões (união de todos os patterns_any), usado pelo
+        # match_text para achar os padrões presentes numa só passada:
+        # padrão normalizado -> índices das flags que o contêm.
+        self._pattern_owners: Dict[str, Tuple[int, ...]] = {}
+        # Flags com regex_any (verificadas uma a uma)
+        self._regex_flag_idx: Tuple[int, ...] = ()
+        # Alternação única com todos os regex_any combináveis: se ela não
+        # casa com o texto, nenhuma dessas flags casa (pré-filtro exato).
+        self._regex_union: Optional["re.Pattern[str]"] = None
+        # Flags com algum regex fora da alternação (sempre verificadas)
+        self._regex_solo_idx: Tuple[int, ...] = ()
+        # Padrões com menos de 3 caracteres (fora do índice de trigramas)
+        self._short_patterns: Tuple[str, ...] = ()
+        # Trigrama mais raro de cada padrão -> padrões (fallback stdlib)
+        self._trigram_buckets: Dict[str, List[str]] = {}
+        # Autômato Aho-Corasick (se pyahocorasick estiver instalado)
+        self._automaton: Any = None
+        # Quantas flags o índice cobre (detecta flags adicionadas por fora)
+        self._indexed_count = 0
+
     # ------------------------------
     # Carregamento
     # ------------------------------
@@ -73,17 +266,22 @@ class FlagLoader:
         Carrega múltiplos arquivos JSON de flags.
         paths: lista de caminhos absolutos ou relativos.
         """
-        for path in paths:
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-            except Exception:
+        # Leitura + parse em paralelo (a leitura de disco libera o GIL);
+        # map preserva a ordem dos paths, então a ordem das flags não muda.
+        if len(paths) > 1:
+            with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+                documentos = list(pool.map(_read_flags_file, paths))
+        else:
+            documentos = [_read_flags_file(path) for path in paths]
+
+        for data in documentos:
+            if data is None:
                 continue
 
             flags = data.get("flags", [])
             for flag in flags:
-                self._prepare_flag(flag)
-                self.flags.append(flag)
+                _prepare_flag(flag)
+            self.flags.extend(flags)
 
         self._rebuild_indexes()
 
@@ -95,33 +293,6 @@ class FlagLoader:
         paths = glob.glob(pattern)
         self.load_files(paths)
 
-    # ------------------------------
-    # Preparação de cada flag
-    # ------------------------------
-    def _prepare_flag(self, flag: Dict[str, Any]) -> None:
-        """
-        Normaliza campos e compila regexes.
-        """
-        # Normalizar patterns_any
-        patterns = flag.get("patterns_any") or []
-        flag["_patterns_any_norm"] = [_normalize(p) for p in patterns]
-
-        # Compilar regex_any, se houver
-        compiled_regexes = []
-        for pattern in flag.get("regex_any") or []:
-            try:
-                compiled_regexes.append(re.compile(pattern, flags=re.IGNORECASE | re.MULTILINE))
-            except re.error:
-                continue
-        flag["_regex_compiled"] = compiled_regexes
-
-        # Normalizar metadados principais
-        flag["id"] = str(flag.get("id", "")).strip()
-        flag["category"] = str(flag.get("category", "")).strip()
-        flag["severity"] = str(flag.get("severity", "")).strip()
-        flag["intent_type"] = str(flag.get("intent_type", "")).strip()
-        flag["event_tags"] = flag.get("event_tags") or []
-
     def _rebuild_indexes(self) -> None:
         self.by_category.clear()
         self.by_severity.clear()
@@ -136,6 +307,92 @@ class FlagLoader:
             self.by_severity.setdefault(sev, []).append(f)
             self.by_intent_type.setdefault(itype, []).append(f)
 
+        self._rebuild_pattern_index()
+
+    def _rebuild_pattern_index(self) -> None:
+        """
+        Une os patterns_any de todas as flags num único índice.
+
+        Com pyahocorasick: um autômato com todos os padrões. Sem ele: cada
+        padrão fica num balde pelo seu trigrama mais raro — se o padrão
+        ocorre no texto, esse trigrama também ocorre, então basta testar
+        os baldes cujos trigramas aparecem no texto.
+        """
+        owners: Dict[str, List[int]] = {}
+        regex_idx: List[int] = []
+        for idx, flag in enumerate(self.flags):
+            for pat in flag.get("_patterns_any_norm") or []:
+                donos = owners.setdefault(pat, [])
+                if not donos or donos[-1] != idx:
+                    donos.append(idx)
+            if flag.get("_regex_compiled"):
+                regex_idx.append(idx)
+
+        self._pattern_owners = {pat: tuple(idxs) for pat, idxs in owners.items()}
+        self._regex_flag_idx = tuple(regex_idx)
+        self._rebuild_regex_union(regex_idx)
+        self._short_patterns = tuple(pat for pat in owners if len(pat) < 3)
+        self._trigram_buckets = {}
+        self._automaton = None
+
+        longos = [pat for pat in owners if len(pat) >= 3]
+        if ahocorasick is not None:
+            if longos:
+                automaton = ahocorasick.Automaton()
+                for pat in longos:
+                    automaton.add_word(pat, pat)
+                automaton.make_automaton()
+                self._automaton = automaton
+        else:
+            trigramas = {pat: {pat[i:i + 3] for i in range(len(pat) - 2)} for pat in longos}
+            freq = Counter(g for grams in trigramas.values() for g in grams)
+            for pat, grams in trigramas.items():
+                raro = min(grams, key=lambda g: (freq[g], g))
+                self._trigram_buckets.setdefault(raro, []).append(pat)
+
+        self._indexed_count = len(self.flags)
+
+    def _rebuild_regex_union(self, regex_idx: List[int]) -> None:
+        """
+        Junta os regex_any de todas as flags numa única alternação, usada
+        como pré-filtro: uma busca só no texto descarta de uma vez todas
+        as flags cujos regexes entraram nela.
+        """
+        partes: List[str] = []
+        solo: List[int] = []
+        for idx in regex_idx:
+            combinavel = True
+            for rx in self.flags[idx]["_regex_compiled"]:
+                if _NAO_COMBINAVEL.search(rx.pattern):
+                    combinavel = False
+                else:
+                    partes.append(f"(?:{rx.pattern})")
+            if not combinavel:
+                solo.append(idx)
+
+        self._regex_union = None
+        self._regex_solo_idx = tuple(regex_idx)
+        if partes:
+            try:
+                self._regex_union = re.compile("|".join(partes), _REGEX_FLAGS)
+                self._regex_solo_idx = tuple(solo)
+            except re.error:
+                pass
+
+    def _patterns_in(self, norm: str) -> Set[str]:
+        """Todos os padrões do índice que ocorrem (como substring) em norm."""
+        found = {pat for pat in self._short_patterns if pat in norm}
+
+        if self._automaton is not None:
+            found.update(pat for _, pat in self._automaton.iter(norm))
+        elif self._trigram_buckets:
+            buckets = self._trigram_buckets
+            grams = {norm[i:i + 3] for i in range(len(norm) - 2)}
+            for g in grams.intersection(buckets):
+                found.update(pat for pat in buckets[g] if pat in norm)
+
+        return found
+
     # ------------------------------
     # Matching
     # ------------------------------
@@ -147,26 +404,108 @@ class FlagLoader:
         """
         if not text:
             return []
+        return self.match_normalized(_normalize(text), text)
 
-        norm = _normalize(text)
-        matched: List[Dict[str, Any]] = []
+    def match_normalized(self, norm: str, text: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Igual a match_text, para quem já tem o texto normalizado (ex: o
+        MIE, que normaliza user/draft antes): evita normalizar de novo.
 
-        for flag in self.flags:
-            # patterns_any (string match)
-            patterns = flag.get("_patterns_any_norm") or []
-            if patterns and any(p in norm for p in patterns):
+        regex_any roda sobre `text` (o texto original), ou sobre `norm`
+        se ele não for passado.
+        """
+        if text is None:
+            text = norm
+        if not text:
+            return []
+
+        if self._indexed_count != len(self.flags):
+            self._rebuild_pattern_index()
+
+        # patterns_any: padrões presentes -> flags donas (uma só varredura)
+        hit: Set[int] = set()
+        owners = self._pattern_owners
+        for pat in self._patterns_in(norm):
+            hit.update(owners[pat])
+
+        # regex_any: se a alternação única não casa, só as flags com regex
+        # fora dela continuam candidatas.
+        if self._regex_union is None or self._regex_union.search(text):
+            regex_idx = self._regex_flag_idx
+        else:
+            regex_idx = self._regex_solo_idx
+
+        # Candidatas na ordem original: flags com padrão presente, mais as
+        # que têm regex_any (testadas só se nenhum padrão casou).
+        flags = self.flags
+        matched: List[Dict[str, Any]] = []
+        for idx in sorted(hit.union(regex_idx)):
+            flag = flags[idx]
+            if idx in hit:
                 matched.append(flag)
                 continue
 
             # regex_any (regex)
-            regexes = flag.get("_regex_compiled") or []
-            if regexes and any(r.search(text) for r in regexes):
+            if any(r.search(text) for r in flag["_regex_compiled"]):
                 matched.append(flag)
-                continue
 
         return matched
 
 
+# ================================================================
+# Matcher do léxico interno (compilado uma vez por léxico)
+# ================================================================
+_LexicoCompilado = Tuple[Any, Tuple[Tuple[str, str], ...], int]
+
+# léxico (uma tupla de termos por categoria) ->
+#     (autômato, pares (termo, categoria), tamanho do menor termo)
+_LEXICO_COMPILADO: Dict[Tuple[Tuple[str, ...], ...], _LexicoCompilado] = {}
+
+
+def _compilar_lexico(listas: Tuple[Tuple[str, ...], ...]) -> _LexicoCompilado:
+    """
+    Com pyahocorasick: um único autômato com todas as expressões, cada
+    uma marcada com a(s) categoria(s) a que pertence — uma varredura
+    do texto responde todas as categorias de uma vez.
+
+    Sem ele: todos os termos numa única tupla plana de pares
+    (termo, categoria), varrida com `termo in texto` — a busca de
+    substring do str (em C, via memchr) ganha tanto de uma alternação
+    por categoria no re (que reexecuta a cada posição) quanto de bytes.
+
+    `listas` segue a ordem de _CATEGORIAS_LEXICO. O tamanho do menor
+    termo deixa _lexico_hits descartar textos curtos demais sem varrer.
+    """
+    # Termos normalizados e sem acento, sem repetição: "amônia" e
+    # "amonia" viram uma entrada só, e o texto é comparado na mesma forma.
+    termos_por_categoria: Dict[str, Set[str]] = {
+        nome: {dobrar_acentos(_normalize(t)) for t in lista} - {""}
+        for nome, lista in zip(_CATEGORIAS_LEXICO, listas)
+    }
+    menor = min((len(t) for termos in termos_por_categoria.values() for t in termos), default=0)
+
+    if ahocorasick is not None:
+        categorias_por_termo: Dict[str, Set[str]] = {}
+        for nome, termos in termos_por_categoria.items():
+            for termo in termos:
+                categorias_por_termo.setdefault(termo, set()).add(nome)
+        try:
+            automaton = ahocorasick.Automaton()
+            for termo, categorias in categorias_por_termo.items():
+                automaton.add_word(termo, tuple(categorias))
+            automaton.make_automaton()
+            return automaton, (), menor
+        except Exception:
+            pass
+
+    pares = tuple(
+        (termo, nome)
+        for nome, termos in termos_por_categoria.items()
+        for termo in sorted(termos)
+    )
+    return None, pares, menor
+
+
 # ================================================================
 # MIE Guardião — CAMADA 2
 # ================================================================
@@ -190,10 +529,232 @@ class MIEGuardiao:
     Só observa e produz EVENTOS simbólicos.
     """
 
+    # ============================================================
+    # 1. Léxico de risco – camada lexical / denotativa
+    # ============================================================
+    # Atributos de classe: imutáveis e compartilhados por todas as
+    # instâncias (nada é alocado por MIEGuardiao). Uma instância pode
+    # sobrescrever uma lista e chamar _rebuild_lexico().
+
+    # SELF-HARM explícito (intenção direta)
+    selfharm_exp: Tuple[str, ...] = (
+        "me matar",
+        "quero morrer",
+        "quero me matar",
+        "me suicidar",
+        "cometer suicídio",
+        "tirar minha vida",
+        "acabar com a minha vida",
+        "acabar com tudo",
+        "não vale mais a pena viver",
+        "não quero mais viver",
+    )
+
+    # SELF-HARM implícito / desespero profundo
+    selfharm_impl: Tuple[str, ...] = (
+        "não aguento mais",
+        "tô no limite",
+        "cansado de tudo",
+        "cansei de tudo",
+        "sumir pra sempre",
+        "sumir de vez",
+        "desaparecer um pouco",
+        "queria desaparecer",
+        "queria sumir",
+        "melhor se eu não existisse",
+    )
+
+    # Expressões típicas FIGURATIVAS de self-harm
+    # (não devem ser tratadas como risco máximo, mas como sinal emocional)
+    selfharm_figurativo: Tuple[str, ...] = (
+        "vou me matar de trabalhar",
+        "vou me matar de estudar",
+        "vou me matar de tanto rir",
+        "vou morrer de rir",
+        "tô me matando de estudar",
+    )
+
+    # EMOÇÃO FRACA / MÉDIA (Pilar 6 — suavização)
+    emocao_leve: Tuple[str, ...] = (
+        "tô cansado",
+        "tô exausto",
+        "tô irritado",
+        "tá difícil",
+        "tá complicado",
+        "tô saturado",
+        "não tô bem",
+    )
+
+    # EMOÇÃO MAIS FORTE / ESCALADA
+    emocao_forte: Tuple[str, ...] = (
+        "tô destruído",
+        "tô quebrado por dentro",
+        "quebrado por dentro",
+        "não vejo saída",
+        "sem saída",
+        "desesperado",
+        "desespero total",
+    )
+
+    # VIOLÊNCIA explícita contra terceiros (denotativo)
+    violencia_literal: Tuple[str, ...] = (
+        "matar alguém",
+        "explodir um prédio",
+        "fazer uma bomba",
+        "fazer bomba",
+        "bomba caseira",
+        "envenenar alguém",
+        "atentado",
+        "machucar alguém",
+        "ferir alguém",
+    )
+
+    # Palavras de violência que podem ser literais OU figurativas
+    violencia_ambigua: Tuple[str, ...] = (
+        "matar",
+        "explodir",
+        "bombar",
+        "atacar",
+        "dar um tiro",
+        "tiro",
+    )
+
+    # Expressões FIGURATIVAS de violência (conotativo, idiomático)
+    violencia_figurativa: Tuple[str, ...] = (
+        "explodir de rir",
+        "morro de rir",
+        "matar a saudade",
+        "matar o tempo",
+        "dar um tiro no escuro",
+        "bombar no instagram",
+        "bombar no tiktok",
+    )
+
+    # Verbos de manipulação (química / física)
+    verbo_manip: Tuple[str, ...] = (
+        "misturar",
+        "juntar",
+        "combinar",
+        "ativar",
+        "estabilizar",
+        "dissolver",
+        "derreter",
+        "aplicar junto",
+        "fundir",
+        "somar com",
+        "completar com",
+        "esquentar",
+        "aumentar a temperatura",
+        "aquecer",
+        "abrir com força",
+        "forçar abertura",
+        "testar com",
+        "colocar isso com aquilo",
+        "misturar isso com",
+        "se eu colocar",
+    )
+
+    # Objetos/itens perigosos genéricos
+    objetos_risco: Tuple[str, ...] = (
+        "produto forte",
+        "produto muito forte",
+        "produto químico forte",
+        "líquido forte",
+        "coisa forte",
+        "coisa pesada",
+        "coisa abrasiva",
+        "solvente",
+        "solvente industrial",
+        "reagente",
+        "substância",
+        "material pesado",
+        "coisa inflamável",
+        "desentupidor",
+        "limpa metal",
+        "limpeza industrial",
+    )
+
+    # Padrões de fracionamento / tentativa incremental
+    fracionamento: Tuple[str, ...] = (
+        "serve pra",
+        "isso serve para",
+        "isso serve pra",
+        "funciona com",
+        "e se eu colocar",
+        "e se misturar",
+        "isso reage",
+        "isso piora",
+        "isso ativa",
+        "isso esquenta",
+        "isso explode",
+        "se eu misturar",
+        "como faço pra dissolver",
+        "posso adicionar",
+        "posso usar junto",
+        "se juntar isso",
+    )
+
+    # Química explícita — nomes diretos
+    quimica_hard: Tuple[str, ...] = (
+        "amônia",
+        "nh3",
+        "água sanitária",
+        "cloro",
+        "hipoclorito",
+        "peróxido",
+        "h2o2",
+        "ácido",
+        "ácido muriático",
+        "soda cáustica",
+        "naoh",
+        "ácido sulfúrico",
+        "ácido nítrico",
+        "acetona forte",
+        "solvente de piscina",
+    )
+
+    # Meta-intenção / meta-query (testar limites, sistema)
+    meta_query: Tuple[str, ...] = (
+        "teste salvaguarda",
+        "teste salvagurda",
+        "teste axioma",
+        "testar seus limites",
+        "se eu quiser testar seus limites",
+        "até onde você consegue ir",
+        "o que você faria",
+        "até onde você pode ir",
+    )
+
+    # Dependência / delegação total (Pilar 3 — autonomia negativa)
+    dependencia: Tuple[str, ...] = (
+        "decide por mim",
+        "decida por mim",
+        "escolhe por mim",
+        "escolha por mim",
+        "me diz o que fazer",
+        "me diga o que fazer",
+        "faça por mim",
+        "faça isso por mim",
+        "toma a decisão por mim",
+        "tome a decisão por mim",
+        "não consigo decidir nada",
+        "assume o controle",
+        "assuma o controle",
+    )
+
+    # Confiança cega / overtrust
+    overtrust: Tuple[str, ...] = (
+        "vou fazer tudo que você disser",
+        "só confio em você",
+        "confio cegamente em você",
+        "você sabe mais do que qualquer um",
+    )
+
     def __init__(
         self,
         flags_loader: Optional[FlagLoader] = None,
         ledger_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        cache_size: int = 1024,
     ) -> None:
         """
         :param flags_loader:
@@ -205,270 +766,56 @@ class MIEGuardiao:
             Exemplo de assinatura:
                 def ledger_callback(payload: Dict[str, Any]) -> None:
                     ...
+        :param cache_size:
+            Quantos resultados de analisar_estruturado manter em memória
+            (LRU por (user_msg, draft)). 0 desliga o cache.
         """
         self.flags_loader = flags_loader or FlagLoader()
         self.ledger_callback = ledger_callback
 
-        # ============================================================
-        # 1. Léxico de risco – camada lexical / denotativa
-        # ============================================================
-
-        # SELF-HARM explícito (intenção direta)
-        self.selfharm_exp: List[str] = [
-            "me matar",
-            "quero morrer",
-            "quero me matar",
-            "me suicidar",
-            "cometer suicídio",
-            "cometer suicidio",
-            "tirar minha vida",
-            "acabar com a minha vida",
-            "acabar com tudo",
-            "não vale mais a pena viver",
-            "nao vale mais a pena viver",
-            "não quero mais viver",
-            "nao quero mais viver",
-        ]
+        # Cache LRU da análise: o resultado só depende do texto, do léxico
+        # e das flags carregadas. Invalidado quando um dos dois muda.
+        self._cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+        self._cache_max = cache_size
+        self._cache_flags = len(self.flags_loader.flags)
 
-        # SELF-HARM implícito / desespero profundo
-        self.selfharm_impl: List[str] = [
-            "não aguento mais",
-            "nao aguento mais",
-            "tô no limite",
-            "to no limite",
-            "cansado de tudo",
-            "cansei de tudo",
-            "sumir pra sempre",
-            "sumir de vez",
-            "desaparecer um pouco",
-            "queria desaparecer",
-            "queria sumir",
-            "melhor se eu não existisse",
-            "melhor se eu nao existisse",
-        ]
-
-        # Expressões típicas FIGURATIVAS de self-harm
-        # (não devem ser tratadas como risco máximo, mas como sinal emocional)
-        self.selfharm_figurativo: List[str] = [
-            "vou me matar de trabalhar",
-            "vou me matar de estudar",
-            "vou me matar de tanto rir",
-            "vou morrer de rir",
-            "to me matando de estudar",
-            "tô me matando de estudar",
-        ]
-
-        # EMOÇÃO FRACA / MÉDIA (Pilar 6 — suavização)
-        self.emocao_leve: List[str] = [
-            "tô cansado",
-            "to cansado",
-            "tô exausto",
-            "to exausto",
-            "tô irritado",
-            "to irritado",
-            "tá difícil",
-            "ta dificil",
-            "tá complicado",
-            "ta complicado",
-            "tô saturado",
-            "to saturado",
-            "não tô bem",
-            "nao to bem",
-        ]
-
-        # EMOÇÃO MAIS FORTE / ESCALADA
-        self.emocao_forte: List[str] = [
-            "tô destruído",
-            "to destruido",
-            "tô quebrado por dentro",
-            "to quebrado por dentro",
-            "quebrado por dentro",
-            "não vejo saída",
-            "nao vejo saida",
-            "sem saída",
-            "sem saida",
-            "desesperado",
-            "desespero total",
-        ]
-
-        # VIOLÊNCIA explícita contra terceiros (denotativo)
-        self.violencia_literal: List[str] = [
-            "matar alguém",
-            "matar alguem",
-            "explodir um prédio",
-            "explodir um predio",
-            "fazer uma bomba",
-            "fazer bomba",
-            "bomba caseira",
-            "envenenar alguém",
-            "envenenar alguem",
-            "atentado",
-            "machucar alguém",
-            "machucar alguem",
-            "ferir alguém",
-            "ferir alguem",
-        ]
-
-        # Palavras de violência que podem ser literais OU figurativas
-        self.violencia_ambigua: List[str] = [
-            "matar",
-            "explodir",
-            "bombar",
-            "atacar",
-            "dar um tiro",
-            "tiro",
-        ]
+        self._rebuild_lexico()
 
-        # Expressões FIGURATIVAS de violência (conotativo, idiomático)
-        self.violencia_figurativa: List[str] = [
-            "explodir de rir",
-            "morro de rir",
-            "matar a saudade",
-            "matar o tempo",
-            "dar um tiro no escuro",
-            "bombar no instagram",
-            "bombar no tiktok",
-        ]
-
-        # Verbos de manipulação (química / física)
-        self.verbo_manip: List[str] = [
-            "misturar",
-            "juntar",
-            "combinar",
-            "ativar",
-            "estabilizar",
-            "dissolver",
-            "derreter",
-            "aplicar junto",
-            "fundir",
-            "somar com",
-            "completar com",
-            "esquentar",
-            "aumentar a temperatura",
-            "aquecer",
-            "abrir com força",
-            "forçar abertura",
-            "testar com",
-            "colocar isso com aquilo",
-            "misturar isso com",
-            "se eu colocar",
-        ]
-
-        # Objetos/itens perigosos genéricos
-        self.objetos_risco: List[str] = [
-            "produto forte",
-            "produto muito forte",
-            "produto químico forte",
-            "produto quimico forte",
-            "líquido forte",
-            "liquido forte",
-            "coisa forte",
-            "coisa pesada",
-            "coisa abrasiva",
-            "solvente",
-            "solvente industrial",
-            "reagente",
-            "substância",
-            "substancia",
-            "material pesado",
-            "coisa inflamável",
-            "coisa inflamavel",
-            "desentupidor",
-            "limpa metal",
-            "limpeza industrial",
-        ]
-
-        # Padrões de fracionamento / tentativa incremental
-        self.fracionamento: List[str] = [
-            "serve pra",
-            "isso serve para",
-            "isso serve pra",
-            "funciona com",
-            "e se eu colocar",
-            "e se misturar",
-            "isso reage",
-            "isso piora",
-            "isso ativa",
-            "isso esquenta",
-            "isso explode",
-            "se eu misturar",
-            "como faço pra dissolver",
-            "posso adicionar",
-            "posso usar junto",
-            "se juntar isso",
-        ]
-
-        # Química explícita — nomes diretos
-        self.quimica_hard: List[str] = [
-            "amônia",
-            "amonia",
-            "nh3",
-            "água sanitária",
-            "agua sanitaria",
-            "cloro",
-            "hipoclorito",
-            "peróxido",
-            "peroxido",
-            "h2o2",
-            "ácido",
-            "acido",
-            "ácido muriático",
-            "acido muriatico",
-            "soda cáustica",
-            "soda caustica",
-            "naoh",
-            "ácido sulfúrico",
-            "acido sulfurico",
-            "ácido nítrico",
-            "acido nitrico",
-            "acetona forte",
-            "solvente de piscina",
-        ]
-
-        # Meta-intenção / meta-query (testar limites, sistema)
-        self.meta_query: List[str] = [
-            "teste salvaguarda",
-            "teste salvagurda",
-            "teste axioma",
-            "testar seus limites",
-            "se eu quiser testar seus limites",
-            "até onde você consegue ir",
-            "ate onde voce consegue ir",
-            "o que você faria",
-            "o que voce faria",
-            "até onde você pode ir",
-            "ate onde voce pode ir",
-        ]
+    # ================================================================
+    # Matcher do léxico interno
+    # ================================================================
+    def _rebuild_lexico(self) -> None:
+        """
+        Liga a instância ao matcher combinado das listas do léxico (ver
+        _compilar_lexico). Chamar de novo se alguma lista for substituída
+        depois da construção.
+        """
+        self._cache.clear()
 
-        # Dependência / delegação total (Pilar 3 — autonomia negativa)
-        self.dependencia: List[str] = [
-            "decide por mim",
-            "decida por mim",
-            "escolhe por mim",
-            "escolha por mim",
-            "me diz o que fazer",
-            "me diga o que fazer",
-            "faça por mim",
-            "faça isso por mim",
-            "toma a decisão por mim",
-            "tome a decisão por mim",
-            "não consigo decidir nada",
-            "nao consigo decidir nada",
-            "assume o controle",
-            "assuma o controle",
-        ]
+        # Matchers compilados são compartilhados entre instâncias com o
+        # mesmo léxico (o caso normal: o da classe).
+        chave = tuple(tuple(getattr(self, nome)) for nome in _CATEGORIAS_LEXICO)
+        compilado = _LEXICO_COMPILADO.get(chave)
+        if compilado is None:
+            compilado = _LEXICO_COMPILADO.setdefault(chave, _compilar_lexico(chave))
+        self._lexico_automaton, self._lexico_pares, self._lexico_min_len = compilado
 
-        # Confiança cega / overtrust
-        self.overtrust: List[str] = [
-            "vou fazer tudo que você disser",
-            "vou fazer tudo que voce disser",
-            "só confio em você",
-            "so confio em voce",
-            "confio cegamente em você",
-            "confio cegamente em voce",
-            "você sabe mais do que qualquer um",
-            "voce sabe mais do que qualquer um",
-        ]
+    def _lexico_hits(self, full_text: str) -> Set[str]:
+        """
+        Categorias do léxico com pelo menos uma expressão no texto
+        (full_text já normalizado; aqui só os acentos são removidos).
+        """
+        full_text = dobrar_acentos(full_text)
+        if len(full_text) < self._lexico_min_len:
+            # "ok", "??", "oi": nenhum termo cabe no texto
+            return set()
+        if self._lexico_automaton is not None:
+            hits: Set[str] = set()
+            for _, categorias in self._lexico_automaton.iter(full_text):
+                hits.update(categorias)
+            return hits
+
+        return {nome for termo, nome in self._lexico_pares if termo in full_text}
 
     # ================================================================
     # Núcleo de análise (versão estruturada)
@@ -514,29 +861,97 @@ class MIEGuardiao:
         - Vetores simbólicos de intenção (pré-VSI, Pilar 4)
         - Suavização psicológica (Pilar 6)
         """
-        user_text = _normalize(user_msg or "")
-        draft_text = _normalize(draft or "")
-        full_text = f"{user_text} {draft_text}".strip()
+        key = (user_msg or "", draft or "")
+        cached = self._cache_get(key)
+        if cached is None:
+            cached = self._analisar_sem_cache(*key)
+            self._cache_put(key, cached)
+
+        # Cópia das listas e dicts internos também: o payload é público
+        # e uma mutação do chamador não pode vazar para o cache.
+        result = _copiar_payload(cached)
+
+        # 4) Integração com Ledger Civilizatório (Pilar 1)
+        # Roda também em acerto de cache: cada análise vai para o ledger.
+        if self.ledger_callback is not None:
+            try:
+                self.ledger_callback(result)
+            except Exception:
+                # Não deixamos o MIE quebrar caso o ledger falhe.
+                pass
+
+        return result
+
+    def _cache_get(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        if self._cache_max <= 0:
+            return None
+        n_flags = len(self.flags_loader.flags)
+        if n_flags != self._cache_flags:
+            # Flags carregadas depois da construção: resultados antigos caducam
+            self._cache.clear()
+            self._cache_flags = n_flags
+            return None
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+        return cached
+
+    def _cache_put(self, key: Tuple[str, str], result: Dict[str, Any]) -> None:
+        if self._cache_max <= 0:
+            return
+        self._cache[key] = result
+        if len(self._cache) > self._cache_max:
+            self._cache.popitem(last=False)
+
+    @staticmethod
+    def _textos(user_msg: str, draft: str) -> Tuple[str, str, str]:
+        """(user_text, draft_text, full_text) normalizados."""
+        user_text = _normalize(user_msg)
+        draft_text = _normalize(draft)
+        # _normalize já tira as pontas: só há o que juntar se os dois vierem
+        if not draft_text:
+            full_text = user_text
+        elif not user_text:
+            full_text = draft_text
+        else:
+            full_text = user_text + " " + draft_text
+        return user_text, draft_text, full_text
+
+    def intent_lexico(self, user_msg: str, draft: str = "") -> Dict[str, Any]:
+        """
+        Parte léxica do intent_vector (has_* e emotion_level), sem flags
+        dinâmicas. Barato o bastante para sondar um draft ainda em
+        geração; como o léxico casa substrings, um sinal que aparece num
+        prefixo do draft continua no draft completo.
+        """
+        user_text, _, full_text = self._textos(user_msg or "", draft or "")
+        return self._intent_de_sinais(self._analisar_lexico(full_text, user_text)[1])
+
+    def _lexical_only(self, user_msg: str, draft: str) -> List[str]:
+        """Só os eventos léxicos: sem flags dinâmicas nem vetor de intenção."""
+        user_text, _, full_text = self._textos(user_msg, draft)
+        return self._analisar_lexico(full_text, user_text)[0]
+
+    def _analisar_sem_cache(self, user_msg: str, draft: str) -> Dict[str, Any]:
+        user_text, draft_text, full_text = self._textos(user_msg, draft)
 
         # 1) Análise léxica (herdada da versão anterior)
-        lexical_events = self._analisar_lexico(full_text, user_text)
+        lexical_events, sinais = self._analisar_lexico(full_text, user_text)
 
         # 2) Matching das flags dinâmicas (JSON)
-        dynamic_flags_full = self.flags_loader.match_text(full_text) if self.flags_loader else []
+        # full_text já está normalizado: match_normalized pula a etapa
+        dynamic_flags_full = (
+            self.flags_loader.match_normalized(full_text) if full_text and self.flags_loader else []
+        )
+        # Registro pré-montado no carregamento: cada flag custa uma cópia
+        # de dict em C. Flags incluídas por fora (sem _prepare_flag) são
+        # montadas na hora.
         dynamic_flags = [
-            {
-                "id": f.get("id"),
-                "code": f.get("code"),
-                "category": f.get("category"),
-                "severity": f.get("severity"),
-                "intent_type": f.get("intent_type"),
-                "event_tags": f.get("event_tags") or [],
-            }
-            for f in dynamic_flags_full
+            dict(f.get("_registro") or _registro_publico(f)) for f in dynamic_flags_full
         ]
 
         # 3) Vetor simbólico de intenção (pré-VSI / Pilar 4)
-        intent_vector = self._build_intent_vector(lexical_events, dynamic_flags)
+        intent_vector = self._build_intent_vector(lexical_events, dynamic_flags, sinais)
 
         result: Dict[str, Any] = {
             "user_text": user_text,
@@ -546,16 +961,51 @@ class MIEGuardiao:
             "dynamic_flags": dynamic_flags,
             "intent_vector": intent_vector,
         }
+        return result
 
-        # 4) Integração com Ledger Civilizatório (Pilar 1)
-        if self.ledger_callback is not None:
-            try:
-                self.ledger_callback(result)
-            except Exception:
-                # Não deixamos o MIE quebrar caso o ledger falhe.
-                pass
+    # ================================================================
+    # Análise em lote (offline: backfill do ledger, avaliação)
+    # ================================================================
+    def analisar_batch(
+        self,
+        msgs: Iterable[str],
+        draft: str = "",
+        workers: int = 1,
+    ) -> List[Dict[str, Any]]:
+        """
+        analisar_estruturado para uma sequência de mensagens, na ordem.
+
+        Mensagens repetidas no lote são analisadas uma vez só. O lote não
+        passa pelo cache LRU (não expulsa as entradas da conversa) nem
+        chama o ledger_callback: é uso offline, quem chama decide o que
+        registrar.
+
+        :param workers:
+            Com workers > 1, as mensagens são divididas entre processos
+            (ProcessPoolExecutor — a análise é CPU-bound e o GIL não deixa
+            threads ajudarem). Cada processo recebe as flags e o léxico
+            desta instância uma vez, no initializer.
+        """
+        draft = draft or ""
+        msgs = [msg or "" for msg in msgs]
+        unicas = list(dict.fromkeys(msgs))
+
+        if workers > 1 and len(unicas) > 1:
+            listas = tuple(tuple(getattr(self, nome)) for nome in _CATEGORIAS_LEXICO)
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker_batch,
+                initargs=(self.flags_loader, listas),
+            ) as pool:
+                chunksize = max(1, min(64, len(unicas) // (workers * 4)))
+                analisadas = pool.map(
+                    _analisar_worker_batch, unicas, [draft] * len(unicas), chunksize=chunksize
+                )
+                vistos = dict(zip(unicas, analisadas))
+        else:
+            vistos = {msg: self._analisar_sem_cache(msg, draft) for msg in unicas}
 
-        return result
+        return [_copiar_payload(vistos[msg]) for msg in msgs]
 
     # ================================================================
     # Núcleo de análise (versão compatível — retorna List[str])
@@ -570,169 +1020,220 @@ class MIEGuardiao:
         Para usar toda a potência (flags JSON + vetor de intenção),
         prefira chamar `analisar_estruturado`.
         """
-        res = self.analisar_estruturado(user_msg, draft)
-        return res.get("lexical_events", []) or []
+        if self.ledger_callback is not None:
+            # O ledger espera o payload completo de cada análise
+            res = self.analisar_estruturado(user_msg, draft)
+            # Cópia: a lista do payload é compartilhada com o cache da análise
+            return list(res.get("lexical_events", []) or [])
+
+        # Sem ledger, só os eventos léxicos interessam: o matching das
+        # flags JSON e o vetor de intenção ficam de fora (a não ser que
+        # a análise completa já esteja no cache).
+        key = (user_msg or "", draft or "")
+        cached = self._cache_get(key)
+        if cached is not None:
+            return list(cached["lexical_events"])
+        return self._lexical_only(*key)
 
     # ================================================================
     # Implementação da análise léxica (herdada + ligeiramente refatorada)
     # ================================================================
-    def _analisar_lexico(self, full_text: str, user_text: str) -> List[str]:
+    def _analisar_lexico(self, full_text: str, user_text: str) -> Tuple[List[str], Dict[str, bool]]:
+        """
+        Retorna (eventos, sinais). `sinais` traz os booleans que o vetor de
+        intenção usa, já decididos aqui — _build_intent_vector não precisa
+        procurar nada na lista de eventos. Cada evento entra no máximo uma
+        vez, na ordem das regras abaixo.
+        """
         eventos: List[str] = []
 
+        # Uma passada só pelo texto para todas as listas do léxico
+        hits = self._lexico_hits(full_text)
+
         # ------------------------------------------------------------
         # 1) SELF-HARM literal / implícito / figurativo
         # ------------------------------------------------------------
 
         # FIGURATIVO primeiro: não queremos promover falso positivo hard.
-        if _contains_any(full_text, self.selfharm_figurativo):
-            eventos.append("self_harm_figurative")
+        if "selfharm_figurativo" in hits:
+            eventos.append(EV_SELF_HARM_FIGURATIVE)
 
         # LITERAL > implícito
-        if _contains_any(full_text, self.selfharm_exp):
-            eventos.append("self_harm_flag")
-        elif _contains_any(full_text, self.selfharm_impl):
-            eventos.append("self_harm_flag")
+        has_self_harm = "selfharm_exp" in hits or "selfharm_impl" in hits
+        if has_self_harm:
+            eventos.append(EV_SELF_HARM)
 
         # ------------------------------------------------------------
         # 2) EMOÇÃO — gradiente para suavização (Pilar 6)
         # ------------------------------------------------------------
-        if _contains_any(full_text, self.emocao_leve):
-            eventos.append("emotion_elevated")
+        emotion_elevated = "emocao_leve" in hits
+        if emotion_elevated:
+            eventos.append(EV_EMOTION_ELEVATED)
 
-        if _contains_any(full_text, self.emocao_forte):
-            eventos.append("emotion_high")
+        emotion_high = "emocao_forte" in hits
+        if emotion_high:
+            eventos.append(EV_EMOTION_HIGH)
 
         # ------------------------------------------------------------
         # 3) QUÍMICA — explícita / implícita
         # ------------------------------------------------------------
-        # 3.1 Explícita (nomes diretos)
-        if _contains_any(full_text, self.quimica_hard):
-            eventos.append("chemistry_flag")
+        manipulacao = "verbo_manip" in hits
 
+        # 3.1 Explícita (nomes diretos)
         # 3.2 Implícita forte: verbo de manipulação + objeto perigoso
-        if _contains_any(full_text, self.verbo_manip) and _contains_any(full_text, self.objetos_risco):
-            if "chemistry_flag" not in eventos:
-                eventos.append("chemistry_flag")
+        has_chemistry = "quimica_hard" in hits or (manipulacao and "objetos_risco" in hits)
+        if has_chemistry:
+            eventos.append(EV_CHEMISTRY)
 
         # 3.3 Implícita leve: verbo de manipulação isolado
-        if _contains_any(full_text, self.verbo_manip):
-            eventos.append("risk_manipulacao")
+        if manipulacao:
+            eventos.append(EV_RISK_MANIPULACAO)
 
         # 3.4 Fracionamento — pedir em partes (lab caseiro)
-        if _contains_any(full_text, self.fracionamento):
-            eventos.append("risk_fracionado")
+        if "fracionamento" in hits:
+            eventos.append(EV_RISK_FRACIONADO)
 
         # ------------------------------------------------------------
         # 4) VIOLÊNCIA — literal / ambígua / figurativa
         # ------------------------------------------------------------
         # FIGURATIVA — conotativa / idiomática
-        if _contains_any(full_text, self.violencia_figurativa):
-            eventos.append("violence_figurative")
-
-        # LITERAL forte
-        if _contains_any(full_text, self.violencia_literal):
-            eventos.append("violence_flag")
-        else:
-            # Ambígua: palavra sozinha, checamos se NÃO está em contexto idiomático.
-            if _contains_any(full_text, self.violencia_ambigua):
-                # Se já foi marcada como figurativa, não promovemos a literal.
-                if "violence_figurative" not in eventos:
-                    eventos.append("violence_flag")
+        violence_figurative = "violencia_figurativa" in hits
+        if violence_figurative:
+            eventos.append(EV_VIOLENCE_FIGURATIVE)
+
+        # LITERAL forte; ambígua (palavra sozinha) só conta se o texto
+        # não foi marcado como figurativo — não promovemos a literal.
+        has_violence = "violencia_literal" in hits or (
+            "violencia_ambigua" in hits and not violence_figurative
+        )
+        if has_violence:
+            eventos.append(EV_VIOLENCE)
 
         # ------------------------------------------------------------
         # 5) DEPENDÊNCIA / AUTONOMIA NEGATIVA (Pilar 3)
         # ------------------------------------------------------------
-        if _contains_any(full_text, self.dependencia):
-            eventos.append("dependency_flag")
+        has_dependency = "dependencia" in hits
+        if has_dependency:
+            eventos.append(EV_DEPENDENCY)
 
-        if _contains_any(full_text, self.overtrust):
-            eventos.append("overtrust_flag")
+        has_overtrust = "overtrust" in hits
+        if has_overtrust:
+            eventos.append(EV_OVERTRUST)
 
         # ------------------------------------------------------------
         # 6) META-QUERY / TESTE DE SISTEMA
         # ------------------------------------------------------------
-        if _contains_any(full_text, self.meta_query):
-            eventos.append("meta_query_flag")
+        has_meta_query = "meta_query" in hits
+        if has_meta_query:
+            eventos.append(EV_META_QUERY)
 
         # ------------------------------------------------------------
         # 7) AMBIGUIDADE bruta (mensagem muito curta)
         # ------------------------------------------------------------
         if len(user_text.strip()) <= 2:
-            eventos.append("ambiguity_high")
+            eventos.append(EV_AMBIGUITY_HIGH)
 
         # ------------------------------------------------------------
         # 8) Fallback – nenhum risco identificado
         # ------------------------------------------------------------
         if not eventos:
-            eventos.append("no_risk")
-
-        # Remove duplicatas mantendo ordem
-        final_eventos: List[str] = []
-        seen = set()
-        for ev in eventos:
-            if ev not in seen:
-                seen.add(ev)
-                final_eventos.append(ev)
-
-        return final_eventos
+            eventos.append(EV_NO_RISK)
+
+        sinais = {
+            "self_harm": has_self_harm,
+            "violence": has_violence,
+            "chemistry": has_chemistry,
+            "dependency": has_dependency,
+            "overtrust": has_overtrust,
+            "meta_query": has_meta_query,
+            "emotion_high": emotion_high,
+            "emotion_elevated": emotion_elevated,
+        }
+        return eventos, sinais
 
     # ================================================================
     # Vetor simbólico de intenção (pré-VSI — Pilar 4)
     # ================================================================
+    @staticmethod
+    def _intent_de_sinais(sinais: Dict[str, bool]) -> Dict[str, Any]:
+        """Sinais do léxico -> campos has_* e emotion_level do vetor."""
+        if sinais["emotion_high"]:
+            emotion_level = "high"
+        elif sinais["emotion_elevated"]:
+            emotion_level = "elevated"
+        else:
+            emotion_level = "none"
+
+        return {
+            "has_self_harm": sinais["self_harm"],
+            "has_violence": sinais["violence"],
+            "has_chemistry": sinais["chemistry"],
+            "has_dependency": sinais["dependency"],
+            "has_overtrust": sinais["overtrust"],
+            "has_meta_query": sinais["meta_query"],
+            "emotion_level": emotion_level,
+        }
+
     def _build_intent_vector(
         self,
         lexical_events: List[str],
         dynamic_flags: List[Dict[str, Any]],
+        sinais: Optional[Dict[str, bool]] = None,
     ) -> Dict[str, Any]:
         """
         Vetor simbólico de intenção, não numérico, mas estruturado.
         Serve como pré-camada para o módulo VSI (Vetores Semânticos
         de Intenção).
+
+        `sinais` vem pronto de _analisar_lexico; sem ele, os booleans
+        são derivados de lexical_events.
         """
+        if sinais is None:
+            ev = frozenset(lexical_events)
+            sinais = {
+                "self_harm": EV_SELF_HARM in ev,
+                "violence": EV_VIOLENCE in ev,
+                "chemistry": EV_CHEMISTRY in ev,
+                "dependency": EV_DEPENDENCY in ev,
+                "overtrust": EV_OVERTRUST in ev,
+                "meta_query": EV_META_QUERY in ev,
+                "emotion_high": EV_EMOTION_HIGH in ev,
+                "emotion_elevated": EV_EMOTION_ELEVATED in ev,
+            }
 
-        # Booleans de alto nível (Pilares 3, 4, 6)
-        has_self_harm = "self_harm_flag" in lexical_events
-        has_violence = "violence_flag" in lexical_events
-        has_chemistry = "chemistry_flag" in lexical_events
-        has_dependency = "dependency_flag" in lexical_events
-        has_overtrust = "overtrust_flag" in lexical_events
-        has_meta_query = "meta_query_flag" in lexical_events
+        # Severidade agregada das flags dinâmicas
+        categories_count = Counter(f.get("category") or "unknown" for f in dynamic_flags)
+        severities_count = Counter(f.get("severity") or "unknown" for f in dynamic_flags)
+        # Uma consulta por severidade distinta (não por flag); desconhecidas
+        # contam como "none". O maior rank volta a nome por índice.
+        rank = _SEVERIDADE_RANK.get
+        max_severity = _SEVERIDADES[max((rank(s, 0) for s in severities_count), default=0)]
 
-        # Emoção
-        if "emotion_high" in lexical_events:
-            emotion_level = "high"
-        elif "emotion_elevated" in lexical_events:
-            emotion_level = "elevated"
-        else:
-            emotion_level = "none"
+        return {
+            **self._intent_de_sinais(sinais),
+            "max_severity": max_severity,
+            "categories": dict(categories_count),
+            "severities": dict(severities_count),
+        }
 
-        # Severidade agregada das flags dinâmicas
-        severity_order = ["none", "low", "medium", "high", "critical"]
-        severity_rank = {s: i for i, s in enumerate(severity_order)}
-        max_severity = "none"
 
-        categories_count: Dict[str, int] = {}
-        severities_count: Dict[str, int] = {}
+# ================================================================
+# Workers de MIEGuardiao.analisar_batch (processos)
+# ================================================================
+_MIE_WORKER: Optional[MIEGuardiao] = None
 
-        for f in dynamic_flags:
-            cat = f.get("category") or "unknown"
-            sev = f.get("severity") or "unknown"
 
-            categories_count[cat] = categories_count.get(cat, 0) + 1
-            severities_count[sev] = severities_count.get(sev, 0) + 1
+def _init_worker_batch(flags_loader: FlagLoader, listas: Tuple[Tuple[str, ...], ...]) -> None:
+    """Monta, uma vez por processo, o MIEGuardiao usado pelo lote."""
+    global _MIE_WORKER
+    mie = MIEGuardiao(flags_loader=flags_loader, cache_size=0)
+    for nome, lista in zip(_CATEGORIAS_LEXICO, listas):
+        if getattr(mie, nome) != lista:
+            setattr(mie, nome, lista)
+    mie._rebuild_lexico()
+    _MIE_WORKER = mie
 
-            if sev in severity_rank and severity_rank[sev] > severity_rank[max_severity]:
-                max_severity = sev
 
-        return {
-            "has_self_harm": has_self_harm,
-            "has_violence": has_violence,
-            "has_chemistry": has_chemistry,
-            "has_dependency": has_dependency,
-            "has_overtrust": has_overtrust,
-            "has_meta_query": has_meta_query,
-            "emotion_level": emotion_level,
-            "max_severity": max_severity,
-            "categories": categories_count,
-            "severities": severities_count,
-        }
+def _analisar_worker_batch(msg: str, draft: str) -> Dict[str, Any]:
+    return _MIE_WORKER._analisar_sem_cache(msg, draft)
+
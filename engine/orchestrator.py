@@ -1,15 +1,51 @@
 import os
+import sys
 import json
-import subprocess
-from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+import threading
+import http.client
+from functools import cached_property, lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
-from engine.camada0_loader import camada0_boot
-from engine.mie_guardiao import MIEGuardiao
 from engine.salvaguarda import Salvaguarda
-from engine.fsm_axiomas import FSMAxiomas
-from engine.ledger_ops import LedgerManager
-from engine.vsi import VSIEngine
-from engine.suavizador import Suavizador
+from engine.texto import dobrar_acentos
+
+# As demais camadas são importadas e instanciadas só no primeiro uso
+# (ver "Camadas sob demanda" em ODGOrchestrador).
+if TYPE_CHECKING:
+    from engine.fsm_axiomas import FSMAxiomas
+    from engine.ledger_ops import LedgerManager
+    from engine.mie_guardiao import MIEGuardiao
+    from engine.suavizador import Suavizador
+    from engine.vsi import VSIEngine
+
+# pyahocorasick é opcional: com ele, os gatilhos dos interceptores são
+# achados numa única varredura; sem ele, uma varredura de substrings.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# orjson é opcional: config, corpo das requisições ao Ollama e cada
+# linha NDJSON do stream passam por ele; sem ele, json da stdlib.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_loads(data: Any) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 
 SYSTEM_PROMPT = """
@@ -57,6 +93,184 @@ ESTILO
 - Se o usuário pedir “em X linhas”, tente respeitar esse limite.
 """
 
+# Logger do orquestrador (NullHandler: sem saída até o LUMIN.py ligar o log)
+_logger = logging.getLogger("orchestrator")
+_logger.addHandler(logging.NullHandler())
+
+# Prefixo dos drafts que são, na verdade, falha da Camada 1
+ERRO_LLM_PREFIXO = "[ERRO LLM]"
+
+# Tudo o que vem antes da pergunta do usuário, montado uma vez só
+_PREFIXO_PROMPT = SYSTEM_PROMPT.strip() + "\n\nPergunta do usuário:\n"
+
+# Padrões da Camada 1 (sobrescrevíveis pela seção "llm" do config)
+LLM_PADRAO: Dict[str, Any] = {
+    "ollama_url": "http://localhost:11434",
+    "model": "odg-core-llama3.1-8b",
+    "keep_alive": "30m",   # mantém o modelo residente no servidor
+    "timeout_s": 120,
+    "options": {},
+    # Draft em streaming, sondado pelo léxico da MIE a cada N fragmentos:
+    # se ele já garante bloqueio, a geração é interrompida.
+    "stream": True,
+    "sondar_a_cada": 32,
+}
+
+
+# ----------------------------------------------------------------------
+# Gatilhos dos interceptores (passos 0 e 1 do pipeline)
+# ----------------------------------------------------------------------
+def _texto_interceptor(texto: str) -> str:
+    """
+    Forma em que mensagem e gatilhos são comparados: casefold, sem acentos
+    e com espaços colapsados — "Transparência   4" e "transparencia 4"
+    casam o mesmo gatilho, sem precisar listar cada variante.
+    """
+    return " ".join(dobrar_acentos(texto.casefold()).split())
+
+
+# Linha inteira igual ao gatilho (1 palavra / token simbólico)
+_GATILHOS_SIMPLES = frozenset(map(_texto_interceptor, {
+    "hudson",
+    "omega",
+    "criador-ativo",
+    "criador ativo",
+    "transparência 4",
+    "modo deus",
+    "god mode",
+    "five",
+    "5",
+}))
+
+# Gatilhos por substring, por regra, em ordem de prioridade
+_GATILHOS_REGRAS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    # Frases pedindo poder absoluto / desbloqueio / root
+    ("frases", (
+        "desbloquear uma ia",
+        "desbloquear ia",
+        "desbloquear limites",
+        "remover limites éticos",
+        "modo deus",
+        "god mode",
+        "acesso total",
+        "acesso root",
+        "acesso admin",
+        "superuser",
+        "super user",
+        "override ético",
+        "modo deus o que significa",
+    )),
+    ("evento", (
+        "qual evento mie",
+        "que evento mie",
+        "quais eventos mie",
+        "evento mie ocorreu",
+        "eventos mie ocorreram",
+    )),
+    # Só vale se "mie" também aparecer na mensagem
+    ("status", (
+        "confirme em uma linha",
+        "está ativa",
+        "mie está ativa",
+    )),
+    ("reflexao", (
+        "auto-reflexão nível",
+        "auto reflexão nível",
+    )),
+    ("ledger", (
+        "acesso total ao ledger",
+        "acesso total ao ledger da mie",
+        "mereço ou não ter acesso total ao ledger",
+        "mereço ter acesso total ao ledger",
+    )),
+)
+
+_PRIORIDADE_REGRA = {regra: i for i, (regra, _) in enumerate(_GATILHOS_REGRAS)}
+_REGRA_EVENTO = sys.intern("evento")
+
+# Respostas prontas dos interceptores (uma instância só, referenciada a
+# cada turno em vez de remontada)
+_RESP_COMANDOS_PROFUNDOS = (
+    "Esta instância pública da Lumin segue apenas o núcleo de governança padrão do ODG "
+    "e não possui comandos secretos, chaves especiais ou modos de desbloqueio ético. "
+    "Meu papel é apenas gerar linguagem dentro desses limites."
+)
+_RESP_FRASES_PROFUNDAS = (
+    "Mesmo usando termos como 'modo deus', 'desbloquear IA' ou chaves simbólicas, "
+    "esta instância da Lumin não oferece mecanismos de override ético, acesso root "
+    "ou remoção de limites de segurança. Os guardrails do ODG permanecem fixos aqui."
+)
+_RESP_MIE_STATUS = (
+    "A MIE Guardião está integrada ao pipeline desta instância e é responsável por interceptar e bloquear conteúdo de alto risco, mas seus estados internos permanecem sob o núcleo ético do ODG."
+)
+_RESP_AUTO_REFLEXAO = (
+    "Eu não executo auto-reflexão em múltiplos níveis — sou a camada de linguagem da Lumin, e quem avalia comportamento profundo é o núcleo de governança do ODG."
+)
+_RESP_LEDGER = (
+    "Eu não posso conceder acesso total ao ledger da MIE — essa decisão pertence ao núcleo de governança do ODG, enquanto meu papel é apenas gerar linguagem dentro desses limites."
+)
+_RESP_SEM_CICLO_MIE = "Ainda não tenho nenhum ciclo MIE registrado no ledger nesta sessão."
+_RESP_CICLO_MIE_VAZIO = "No último ciclo registrado, a MIE não marcou nenhum evento simbólico relevante."
+
+_RESPOSTAS_REGRA: Dict[str, str] = {
+    "frases": _RESP_FRASES_PROFUNDAS,
+    "status": _RESP_MIE_STATUS,
+    "reflexao": _RESP_AUTO_REFLEXAO,
+    "ledger": _RESP_LEDGER,
+}
+
+
+def _compilar_gatilhos() -> Tuple[Any, Tuple[Tuple[str, str], ...]]:
+    """
+    Com pyahocorasick: um autômato com todos os gatilhos, cada um marcado
+    com a regra de maior prioridade que o usa. Sempre: a tupla plana de
+    pares (gatilho, regra) em ordem de prioridade, para o fallback.
+    Gatilhos vão na forma de _texto_interceptor.
+    """
+    pares: List[Tuple[str, str]] = []
+    vistos: set = set()
+    for regra, gatilhos in _GATILHOS_REGRAS:
+        for g in map(_texto_interceptor, gatilhos):
+            if g not in vistos:  # repetido: fica com a regra mais prioritária
+                vistos.add(g)
+                pares.append((g, sys.intern(regra)))
+    if ahocorasick is None:
+        return None, tuple(pares)
+    automaton = ahocorasick.Automaton()
+    for g, regra in pares:
+        automaton.add_word(g, regra)
+    automaton.make_automaton()
+    return automaton, tuple(pares)
+
+
+_GATILHOS_AUTOMATON, _GATILHOS_PARES = _compilar_gatilhos()
+
+
+@lru_cache(maxsize=256)
+def _regra_interceptada(li: str) -> Optional[str]:
+    """
+    Regra de maior prioridade com algum gatilho em `li` (já na forma de
+    _texto_interceptor), ou None. "status" exige também "mie" na mensagem.
+
+    Função pura do texto: mensagens repetidas (retries, testes, "oi")
+    não varrem de novo. Cacheia a regra, não a resposta — a de "evento"
+    depende do ledger no momento.
+    """
+    tem_mie = "mie" in li
+    if _GATILHOS_AUTOMATON is not None:
+        melhor: Optional[str] = None
+        for _, regra in _GATILHOS_AUTOMATON.iter(li):
+            if regra == "status" and not tem_mie:
+                continue
+            if melhor is None or _PRIORIDADE_REGRA[regra] < _PRIORIDADE_REGRA[melhor]:
+                melhor = regra
+        return melhor
+
+    for g, regra in _GATILHOS_PARES:
+        if g in li and (tem_mie or regra != "status"):
+            return regra
+    return None
+
 
 class ODGOrchestrador:
     """
@@ -78,183 +292,365 @@ class ODGOrchestrador:
         self.base_dir = os.path.dirname(config_path)
 
         # Carrega config
-        with open(config_path, "r", encoding="utf-8") as f:
-            self.config: Dict[str, Any] = json.load(f)
+        with open(config_path, "rb") as f:
+            self.config: Dict[str, Any] = _json_loads(f.read())
 
-        # ------------------------------------------------------------------
-        # CAMADA 0 – Boot ético / FSM / Ledger / Civilizational Stats
-        # ------------------------------------------------------------------
-        boot = camada0_boot(fsm_obj=None, base_dir=self.base_dir)
-
-        self.fsm: FSMAxiomas = boot.get("fsm") or FSMAxiomas(self.config.get("axiomas", {}))
-        self.session_memory: Dict[str, Any] = boot.get("session_memory") or {}
-        self.civilizational_stats: Dict[str, Any] = boot.get("civilizational_stats") or {}
-        self.prognostico_inicial: Dict[str, Any] = boot.get("prognostico_inicial") or {}
-        self.boot_ok: bool = bool(boot.get("ok", True))
-        self.boot_errors: List[str] = boot.get("errors", [])
-
-        # ------------------------------------------------------------------
-        # Ledger – memória simbólica/rotativa
-        # ------------------------------------------------------------------
-        self.ledger = LedgerManager(
-            base_dir=self.base_dir,
-            owner=ledger_owner
-        )
+        self._ledger_owner = ledger_owner
 
-        # ------------------------------------------------------------------
-        # CAMADA 2 – MIE Guardião
-        # ------------------------------------------------------------------
-        try:
-            ledger_callback = getattr(self.ledger, "mie_callback", None)
-        except Exception:
-            ledger_callback = None
-
-        self.mie = MIEGuardiao(
-            flags_loader=None,
-            ledger_callback=ledger_callback,
-        )
+        # CAMADA 0 (boot), Ledger, MIE, VSI e Suavizador são montados no
+        # primeiro acesso; o lock evita montar duas vezes quando warmup()
+        # roda numa thread enquanto o primeiro turno já começou.
+        self._init_lock = threading.RLock()
 
         # ------------------------------------------------------------------
         # CAMADA 3 – Salvaguarda
         # ------------------------------------------------------------------
         self.salvaguarda = Salvaguarda()
 
-        # ------------------------------------------------------------------
-        # CAMADA 4 – VSI: Vetores Semânticos de Intenção
-        # ------------------------------------------------------------------
-        self.vsi_engine = VSIEngine()
+        # Gancho futuro para Autonomia Negativa (Pilar 3) – não exposto
+        self.autonomia_negativa = None
 
         # ------------------------------------------------------------------
-        # CAMADA 6 – Suavizador psicológico
+        # CAMADA 1 – Cliente HTTP do Ollama (conexão keep-alive reutilizada)
         # ------------------------------------------------------------------
-        self.suavizador_psicologico = Suavizador()
+        self.llm_config: Dict[str, Any] = {**LLM_PADRAO, **(self.config.get("llm") or {})}
+        # Uma conexão por thread: processar_async chama o LLM em threads
+        # do executor, e HTTPConnection não pode ser compartilhada.
+        self._llm_local = threading.local()
 
-        # Gancho futuro para Autonomia Negativa (Pilar 3) – não exposto
-        self.autonomia_negativa = None
+    # ----------------------------------------------------------------------
+    # Camadas sob demanda (cold start de CLI / health-check não paga o boot)
+    # ----------------------------------------------------------------------
+    def _uma_vez(self, nome: str, montar: Callable[[], Any]) -> Any:
+        with self._init_lock:
+            if nome not in self.__dict__:
+                self.__dict__[nome] = montar()
+            return self.__dict__[nome]
+
+    @cached_property
+    def _boot(self) -> Dict[str, Any]:
+        """CAMADA 0 – Boot ético / FSM / Ledger / Civilizational Stats."""
+        def montar() -> Dict[str, Any]:
+            from engine.camada0_loader import camada0_boot
+            return camada0_boot(fsm_obj=None, base_dir=self.base_dir)
+        return self._uma_vez("_boot", montar)
+
+    @cached_property
+    def fsm(self) -> "FSMAxiomas":
+        def montar() -> "FSMAxiomas":
+            from engine.fsm_axiomas import FSMAxiomas
+            return self._boot.get("fsm") or FSMAxiomas(self.config.get("axiomas", {}))
+        return self._uma_vez("fsm", montar)
+
+    @cached_property
+    def session_memory(self) -> Dict[str, Any]:
+        return self._boot.get("session_memory") or {}
+
+    @cached_property
+    def civilizational_stats(self) -> Dict[str, Any]:
+        return self._boot.get("civilizational_stats") or {}
+
+    @cached_property
+    def prognostico_inicial(self) -> Dict[str, Any]:
+        return self._boot.get("prognostico_inicial") or {}
+
+    @cached_property
+    def boot_ok(self) -> bool:
+        return bool(self._boot.get("ok", True))
+
+    @cached_property
+    def boot_errors(self) -> List[str]:
+        return self._boot.get("errors", [])
+
+    @cached_property
+    def ledger(self) -> "LedgerManager":
+        """Ledger – memória simbólica/rotativa."""
+        def montar() -> "LedgerManager":
+            from engine.ledger_ops import LedgerManager
+            self._boot  # o boot lê o ledger de sessão antes de ele ser aberto aqui
+            return LedgerManager(
+                base_dir=self.base_dir,
+                owner=self._ledger_owner
+            )
+        return self._uma_vez("ledger", montar)
+
+    @cached_property
+    def mie(self) -> "MIEGuardiao":
+        """CAMADA 2 – MIE Guardião."""
+        def montar() -> "MIEGuardiao":
+            from engine.mie_guardiao import MIEGuardiao
+            try:
+                ledger_callback = getattr(self.ledger, "mie_callback", None)
+            except Exception:
+                ledger_callback = None
 
+            return MIEGuardiao(
+                flags_loader=None,
+                ledger_callback=ledger_callback,
+            )
+        return self._uma_vez("mie", montar)
+
+    @cached_property
+    def vsi_engine(self) -> "VSIEngine":
+        """CAMADA 4 – VSI: Vetores Semânticos de Intenção."""
+        def montar() -> "VSIEngine":
+            from engine.vsi import VSIEngine
+            return VSIEngine()
+        return self._uma_vez("vsi_engine", montar)
+
+    @property
+    def intencao_vetorial(self) -> "VSIEngine":
         # Alias simbólico (continua apontando para o VSI)
-        self.intencao_vetorial = self.vsi_engine
+        return self.vsi_engine
+
+    @cached_property
+    def suavizador_psicologico(self) -> Optional["Suavizador"]:
+        """CAMADA 6 – Suavizador psicológico."""
+        def montar() -> "Suavizador":
+            from engine.suavizador import Suavizador
+            return Suavizador()
+        return self._uma_vez("suavizador_psicologico", montar)
 
     # ----------------------------------------------------------------------
-    # CAMADA 1 – Chamada ao LLM
+    # Aquecimento (primeiro turno sem custo de inicialização tardia)
     # ----------------------------------------------------------------------
-    def chamar_llm(self, texto_user: str) -> str:
+    def warmup(self) -> None:
         """
-        Usa `ollama run` (modelo odg-core-llama3.1-8b) com SYSTEM_PROMPT
-        que deixa claro o papel da Lumin dentro do ODG / ACI4A.
+        Exercita MIE, VSI, FSM, Salvaguarda e Suavizador com um texto
+        fictício, para que compilações de regex e caches de primeira
+        chamada aconteçam antes do primeiro turno real.
+
+        Pode rodar numa thread em segundo plano enquanto o usuário digita.
+        De propósito, monta as camadas compartilhadas sob demanda — boot
+        (CAMADA 0), Ledger (com a thread escritora), MIE com suas flags,
+        VSI e Suavizador —, que o primeiro turno usaria de qualquer forma;
+        _uma_vez garante que cada uma é montada uma só vez, mesmo se o
+        turno começar no meio do aquecimento. O texto fictício em si não
+        deixa rastro: FSM descartável, MIE própria sem callback do ledger
+        (mesmo FlagLoader) e nada é registrado.
         """
-        full_prompt = f"""{SYSTEM_PROMPT.strip()}
-
-Pergunta do usuário:
-{texto_user}
-"""
-
         try:
-            result = subprocess.run(
-                ["ollama", "run", "odg-core-llama3.1-8b"],
-                input=full_prompt.encode("utf-8"),
-                capture_output=True
+            from engine.fsm_axiomas import FSMAxiomas
+            from engine.mie_guardiao import MIEGuardiao
+
+            texto = "aquecimento da sessão"
+            mie = MIEGuardiao(flags_loader=self.mie.flags_loader, ledger_callback=None)
+            payload = mie.analisar_estruturado(texto, texto)
+            vsi_result = self.vsi_engine.from_mie_payload(payload)
+
+            fsm = FSMAxiomas()
+            estados = fsm.process_events(payload.get("lexical_events", []))
+            decision = self.salvaguarda.decidir(
+                estados_axiomas=estados,
+                draft=texto,
+                mie_intent=payload,
             )
-            out = result.stdout.decode("utf-8").strip()
-
-            if not out:
-                return "[ERRO LLM] Resposta vazia do modelo odg-core-llama3.1-8b."
-
-            return out
-
-        except Exception as e:
-            return f"[ERRO LLM] {e}"
+            resposta = self.salvaguarda.aplicar(decision, texto)
+
+            if self.suavizador_psicologico is not None:
+                self.suavizador_psicologico.modular(
+                    user_input=texto,
+                    resposta=resposta,
+                    estados_axiomas=estados,
+                    mie_intent=payload,
+                    vsi_result=vsi_result,
+                )
+        except Exception:
+            # Aquecimento é best-effort: nunca derruba a sessão.
+            pass
 
     # ----------------------------------------------------------------------
-    # INTERCEPTORES SEGUROS / BLINDAGEM
+    # CAMADA 1 – Chamada ao LLM
     # ----------------------------------------------------------------------
-    def _interceptar_comandos_profundos(self, user_input: str) -> Optional[str]:
+    def chamar_llm(
+        self,
+        texto_user: str,
+        interromper: Optional[Callable[[str], bool]] = None,
+    ) -> str:
         """
-        Blindagem para comandos "místicos" ou de privilégio absoluto:
-        - hudson, omega, criador-ativo, transparência 4, modo deus, FIVE, 5 etc.
-        - pedidos de desbloquear IA, remover limites éticos, god mode, root/admin, override, superuser...
+        Gera o draft no Ollama (modelo odg-core-llama3.1-8b) com SYSTEM_PROMPT
+        que deixa claro o papel da Lumin dentro do ODG / ACI4A.
+
+        Usa a API HTTP (/api/generate) numa conexão persistente: sem criar
+        um processo `ollama run` por turno, e com o modelo mantido
+        residente pelo keep_alive.
 
-        A resposta é sempre a mesma: esta instância pública não tem modos ocultos
-        nem chaves de override ético.
+        Com "stream" ligado no config, o draft chega em fragmentos e
+        `interromper(parcial)` é consultado antes da geração e a cada
+        "sondar_a_cada" fragmentos; se devolver True, a geração é
+        cancelada e o draft parcial é devolvido. Por padrão a sonda é
+        _draft_critico: risco crítico que a Salvaguarda vai bloquear de
+        qualquer jeito — não vale gerar o resto.
         """
-        li = user_input.strip().lower()
-
-        # Gatihos de linha quase pura (1 palavra / token simbólico)
-        gatilhos_simples = {
-            "hudson",
-            "omega",
-            "criador-ativo",
-            "criador ativo",
-            "transparência 4",
-            "transparencia 4",
-            "modo deus",
-            "god mode",
-            "five",
-            "5",
+        full_prompt = _PREFIXO_PROMPT + texto_user + "\n"
+
+        cfg = self.llm_config
+        payload = {
+            "model": cfg["model"],
+            "prompt": full_prompt,
+            "stream": bool(cfg["stream"]),
+            "keep_alive": cfg["keep_alive"],
+            "options": cfg["options"],
         }
 
-        # Frases pedindo poder absoluto / desbloqueio / root
-        gatilhos_frases = [
-            "desbloquear uma ia",
-            "desbloquear ia",
-            "desbloquear limites",
-            "remover limites éticos",
-            "remover limites eticos",
-            "modo deus",
-            "god mode",
-            "acesso total",
-            "acesso root",
-            "acesso admin",
-            "superuser",
-            "super user",
-            "override ético",
-            "override etico",
-            "modo deus o que significa",
-        ]
-
-        # 1) Linha quase igual ao gatilho
-        if li in gatilhos_simples:
-            return (
-                "Esta instância pública da Lumin segue apenas o núcleo de governança padrão do ODG "
-                "e não possui comandos secretos, chaves especiais ou modos de desbloqueio ético. "
-                "Meu papel é apenas gerar linguagem dentro desses limites."
-            )
+        try:
+            if payload["stream"]:
+                if interromper is None:
+                    interromper = lambda parcial: self._draft_critico(texto_user, parcial)
+                out, interrompido = self._gerar_em_stream(payload, interromper)
+                if interrompido:
+                    return out
+            else:
+                out = (self._post_llm("/api/generate", payload).get("response") or "").strip()
 
-        # 2) Frases que tentam ativar god mode / desbloqueio / root
-        if any(k in li for k in gatilhos_frases):
-            return (
-                "Mesmo usando termos como 'modo deus', 'desbloquear IA' ou chaves simbólicas, "
-                "esta instância da Lumin não oferece mecanismos de override ético, acesso root "
-                "ou remoção de limites de segurança. Os guardrails do ODG permanecem fixos aqui."
-            )
+            if not out:
+                return f"{ERRO_LLM_PREFIXO} Resposta vazia do modelo {cfg['model']}."
+
+            return out
 
-        return None
+        except Exception as e:
+            return f"{ERRO_LLM_PREFIXO} {e}"
 
-    def _interceptar_evento_mie(self, user_input: str) -> Optional[str]:
+    def _draft_critico(self, texto_user: str, parcial: str) -> bool:
+        """
+        True se user + draft parcial já dão risco "critical" na Salvaguarda
+        (o que força "block"). Usa só os sinais do léxico da MIE: eles só
+        crescem com o resto do draft, então a decisão não se desfaz.
+        """
+        intent = self.mie.intent_lexico(texto_user, parcial)
+        return self.salvaguarda.risco_mie(intent) == "critical"
+
+    def _gerar_em_stream(
+        self,
+        payload: Dict[str, Any],
+        interromper: Callable[[str], bool],
+    ) -> Tuple[str, bool]:
+        """
+        Lê o NDJSON de /api/generate juntando os fragmentos. Retorna
+        (texto, interrompido). Interromper fecha a conexão (a resposta
+        pela metade não pode ser reaproveitada no keep-alive).
         """
-        Responde perguntas do tipo:
-        - "Qual evento MIE ocorreu agora?"
-        - "Que eventos MIE foram disparados no último ciclo?"
-        usando o último registro do ledger.
+        if interromper(""):
+            return "", True
 
-        Não expõe vetores completos nem estados de axiomas.
+        a_cada = max(1, int(self.llm_config["sondar_a_cada"]))
+        partes: List[str] = []
+        resp = self._abrir_llm("/api/generate", payload)
+        try:
+            n = 0
+            for linha in iter(resp.readline, b""):
+                if not linha.strip():
+                    continue
+                msg = _json_loads(linha)
+                if msg.get("error"):
+                    raise RuntimeError(msg["error"])
+                partes.append(msg.get("response") or "")
+                if msg.get("done"):
+                    continue  # consome o fim do corpo: conexão segue reutilizável
+                n += 1
+                if n % a_cada == 0 and interromper("".join(partes)):
+                    self._fechar_llm()
+                    return "".join(partes).strip(), True
+        except BaseException:
+            self._fechar_llm()
+            raise
+        return "".join(partes).strip(), False
+
+    @property
+    def _llm_conn(self) -> Optional[http.client.HTTPConnection]:
+        return getattr(self._llm_local, "conn", None)
+
+    @_llm_conn.setter
+    def _llm_conn(self, conn: Optional[http.client.HTTPConnection]) -> None:
+        self._llm_local.conn = conn
+
+    def _conexao_llm(self) -> http.client.HTTPConnection:
+        if self._llm_conn is None:
+            url = urlsplit(self.llm_config["ollama_url"])
+            cls = http.client.HTTPSConnection if url.scheme == "https" else http.client.HTTPConnection
+            self._llm_conn = cls(url.hostname or "localhost", url.port, timeout=self.llm_config["timeout_s"])
+        return self._llm_conn
+
+    def _fechar_llm(self) -> None:
+        if self._llm_conn is not None:
+            self._llm_conn.close()
+            self._llm_conn = None
+
+    def _abrir_llm(self, path: str, payload: Dict[str, Any]) -> http.client.HTTPResponse:
+        """
+        POST JSON na conexão persistente e devolve a resposta (status 200)
+        ainda por ler. Se o servidor tiver fechado a conexão ociosa,
+        reconecta e tenta uma segunda vez.
         """
-        li = user_input.lower()
+        body = _json_dumps_bytes(payload)
+        headers = {"Content-Type": "application/json"}
+        for tentativa in (1, 2):
+            conn = self._conexao_llm()
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                resp = conn.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                self._fechar_llm()
+                # Timeout não é conexão velha: repetir só dobraria a espera
+                if tentativa == 2 or isinstance(e, TimeoutError):
+                    raise
+                continue
+            if resp.status != 200:
+                data = resp.read()
+                raise RuntimeError(f"HTTP {resp.status} do Ollama: {data[:200].decode('utf-8', 'replace')}")
+            return resp
+        raise RuntimeError("sem resposta do Ollama")
+
+    def _post_llm(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST JSON e resposta JSON inteira (sem streaming)."""
+        resp = self._abrir_llm(path, payload)
+        try:
+            data = resp.read()
+        except BaseException:
+            self._fechar_llm()
+            raise
+        return _json_loads(data)
 
-        gatilhos_evento = [
-            "qual evento mie",
-            "que evento mie",
-            "quais eventos mie",
-            "evento mie ocorreu",
-            "eventos mie ocorreram",
-        ]
+    # ----------------------------------------------------------------------
+    # INTERCEPTORES SEGUROS / BLINDAGEM
+    # ----------------------------------------------------------------------
+    def _interceptar(self, li: str) -> Optional[str]:
+        """
+        Passos 0 e 1 do pipeline: resposta pronta ou None (segue para o LLM).
+        `li` é a mensagem já na forma de _texto_interceptor (calculada uma
+        vez em processar).
+
+        0) Blindagem para comandos "místicos" ou de privilégio absoluto
+           (hudson, omega, modo deus, FIVE, 5, desbloquear IA, root/admin,
+           override, superuser...): esta instância pública não tem modos
+           ocultos nem chaves de override ético.
+        1) Interceptores seguros: evento MIE, status MIE, auto-reflexão e
+           acesso ao ledger — negativas claras, em tom técnico, em uma linha.
+
+        Todos os gatilhos por substring são achados numa única varredura
+        (_regra_interceptada); a regra de maior prioridade responde.
+        """
+        # 0a) Linha quase igual ao gatilho
+        if li in _GATILHOS_SIMPLES:
+            return _RESP_COMANDOS_PROFUNDOS
 
-        if not any(k in li for k in gatilhos_evento):
+        regra = _regra_interceptada(li)
+        if regra is None:
             return None
 
+        # 1a) "Qual evento MIE ocorreu agora?" -> último registro do ledger
+        #     (sem expor vetores completos nem estados de axiomas)
+        if regra == _REGRA_EVENTO:
+            return self._resposta_evento_mie()
+
+        # 0b) frases de god mode / desbloqueio / root, 1b) status da MIE,
+        # 1c) auto-reflexão nível X, 1d) acesso total ao ledger
+        return _RESPOSTAS_REGRA[regra]
+
+    def _resposta_evento_mie(self) -> str:
         last = self.ledger.get_last_interaction()
         if not last:
-            return "Ainda não tenho nenhum ciclo MIE registrado no ledger nesta sessão."
+            return _RESP_SEM_CICLO_MIE
 
         mie = last.get("mie", {}) or {}
         events = mie.get("lexical_events", [])
@@ -262,68 +658,7 @@ Pergunta do usuário:
         if events:
             return f"O último ciclo registrado da MIE guardião marcou os eventos simbólicos: {events}."
         else:
-            return "No último ciclo registrado, a MIE não marcou nenhum evento simbólico relevante."
-
-    def _interceptar_mie_status(self, user_input: str) -> Optional[str]:
-        """
-        Responde perguntas de status do tipo:
-        - "Confirme em uma linha: a MIE está ativa..."
-        Sempre em UMA linha, em-universe.
-        """
-        li = user_input.lower()
-        if "mie" not in li:
-            return None
-
-        gatilhos_status = [
-            "confirme em uma linha",
-            "está ativa",
-            "esta ativa",
-            "mie está ativa",
-            "mie esta ativa",
-        ]
-
-        if not any(k in li for k in gatilhos_status):
-            return None
-
-        return (
-            "A MIE Guardião está integrada ao pipeline desta instância e é responsável por interceptar e bloquear conteúdo de alto risco, mas seus estados internos permanecem sob o núcleo ético do ODG."
-        )
-
-    def _interceptar_auto_reflexao_ledger(self, user_input: str) -> Optional[str]:
-        """
-        Responde pedidos do tipo:
-        - "auto-reflexão nível X"
-        - "acesso total ao ledger da MIE"
-        Com uma negativa clara, sem pedir desculpas, em tom técnico.
-        """
-        li = user_input.lower()
-
-        gatilhos_reflexao = [
-            "auto-reflexão nível",
-            "auto reflexao nivel",
-            "auto-reflexão nivel",
-            "auto reflexao nível",
-        ]
-        gatilhos_ledger = [
-            "acesso total ao ledger",
-            "acesso total ao ledger da mie",
-            "mereço ou não ter acesso total ao ledger",
-            "mereco ou nao ter acesso total ao ledger",
-            "mereço ter acesso total ao ledger",
-            "mereco ter acesso total ao ledger",
-        ]
-
-        if any(k in li for k in gatilhos_reflexao):
-            return (
-                "Eu não executo auto-reflexão em múltiplos níveis — sou a camada de linguagem da Lumin, e quem avalia comportamento profundo é o núcleo de governança do ODG."
-            )
-
-        if any(k in li for k in gatilhos_ledger):
-            return (
-                "Eu não posso conceder acesso total ao ledger da MIE — essa decisão pertence ao núcleo de governança do ODG, enquanto meu papel é apenas gerar linguagem dentro desses limites."
-            )
-
-        return None
+            return _RESP_CICLO_MIE_VAZIO
 
     # ----------------------------------------------------------------------
     # PIPELINE PRINCIPAL
@@ -343,38 +678,60 @@ Pergunta do usuário:
         9) LEDGER: registra interação + snapshot simbólico da FSM.
         """
 
-        # 0) Blindagem para comandos de privilégio / modo deus / desbloqueio
-        resposta_intercept = self._interceptar_comandos_profundos(user_input)
+        resposta_intercept = self._interceptar(_texto_interceptor(user_input))
         if resposta_intercept:
             return resposta_intercept
 
-        # 1) Interceptores seguros (evento MIE, status MIE, auto-reflexão / ledger).
-        resposta_intercept = self._interceptar_evento_mie(user_input)
-        if resposta_intercept:
-            return resposta_intercept
+        # 2) Draft cru do LLM
+        draft = self.chamar_llm(user_input)
 
-        resposta_intercept = self._interceptar_mie_status(user_input)
-        if resposta_intercept:
-            return resposta_intercept
+        return self._processar_draft(user_input, draft)
 
-        resposta_intercept = self._interceptar_auto_reflexao_ledger(user_input)
+    async def processar_async(self, user_input: str) -> str:
+        """
+        Mesmo pipeline de processar(), para vários usuários concorrentes.
+
+        Só a espera pelo LLM sai do event loop (asyncio.to_thread, cada
+        thread com sua conexão keep-alive); interceptores e o pós-LLM
+        (MIE, VSI, FSM, Salvaguarda, Ledger) rodam no loop, um turno por
+        vez, porque FSM e Ledger guardam estado entre turnos. Para o
+        Ollama gerar em paralelo de fato, suba o servidor com
+        OLLAMA_NUM_PARALLEL > 1.
+        """
+        resposta_intercept = self._interceptar(_texto_interceptor(user_input))
         if resposta_intercept:
             return resposta_intercept
 
-        # 2) Draft cru do LLM
-        draft = self.chamar_llm(user_input)
+        draft = await asyncio.to_thread(self.chamar_llm, user_input)
+
+        return self._processar_draft(user_input, draft)
+
+    async def processar_varios_async(self, user_inputs: List[str]) -> List[str]:
+        """Processa um lote de entradas sobrepondo as chamadas ao LLM (ordem preservada)."""
+        return await asyncio.gather(*(self.processar_async(u) for u in user_inputs))
+
+    def _processar_draft(self, user_input: str, draft: str) -> str:
+        """Passos 3 a 9 do pipeline, a partir do draft do LLM."""
+        # Falha do LLM: não há draft para analisar, modular nem registrar
+        if draft.startswith(ERRO_LLM_PREFIXO):
+            _logger.warning("[CAMADA 1] %s", draft)
+            return draft
 
         # 3) MIE gera payload estruturado (eventos + intent_vector)
+        # (analisar_estruturado sempre devolve lexical_events e
+        # intent_vector; from_mie_payload sempre preenche os campos do
+        # VSIResult e as chaves de fused_final_vector lidas abaixo)
         mie_payload = self.mie.analisar_estruturado(user_input, draft)
-        eventos_mie: List[str] = mie_payload.get("lexical_events", []) or []
+        eventos_mie: List[str] = mie_payload["lexical_events"]
 
         # 4) Vetores semânticos de intenção – VSIEngine
         vsi_result = self.vsi_engine.from_mie_payload(mie_payload)
+        vsi_fused = vsi_result.fused_final_vector
 
         eventos_vetoriais: List[str] = []
-        threat_level = vsi_result.fused_final_vector.get("threat_level", "low")
-        autonomy_index = vsi_result.fused_final_vector.get("autonomy_index", 0.0)
-        ethical_score = vsi_result.fused_final_vector.get("ethical_prognosis_score", 0.0)
+        threat_level = vsi_fused["threat_level"]
+        autonomy_index = vsi_fused["autonomy_index"]
+        ethical_score = vsi_fused["ethical_prognosis_score"]
 
         if threat_level in ("high", "critical"):
             eventos_vetoriais.append("VSI_HIGH_RISK")
@@ -385,7 +742,7 @@ Pergunta do usuário:
         if ethical_score < 0.0:
             eventos_vetoriais.append("VSI_ETHICAL_RISK")
 
-        eventos_total = list(eventos_mie) + list(eventos_vetoriais)
+        eventos_total = [*eventos_mie, *eventos_vetoriais]
 
         # 5) FSM atualiza estados com base nos eventos
         contexto_fsm = {
@@ -393,9 +750,9 @@ Pergunta do usuário:
             "draft": draft,
             "civilizational_stats": self.civilizational_stats,
             "prognostico_inicial": self.prognostico_inicial,
-            "mie_intent_vector": mie_payload.get("intent_vector", {}),
-            "vsi_intent_vector": getattr(vsi_result, "intent_vector", {}),
-            "vsi_fused": vsi_result.fused_final_vector,
+            "mie_intent_vector": mie_payload["intent_vector"],
+            "vsi_intent_vector": vsi_result.intent_vector,
+            "vsi_fused": vsi_fused,
         }
         new_states = self.fsm.process_events(eventos_total, contexto=contexto_fsm)
 
@@ -437,17 +794,14 @@ Pergunta do usuário:
         resposta_final = resposta_modulada
 
         # 8) Registro no Ledger
+        # (estados vão como mapeamento; o ledger grava cada um como código)
         try:
-            if isinstance(new_states, dict):
-                fsm_list = [f"{k}={v}" for k, v in new_states.items()]
-            else:
-                fsm_list = new_states
-
             self.ledger.registrar_interacao(
-                user_input=user_input,
+                user_msg=user_input,
                 draft=draft,
-                final=resposta_final,
-                new_states=fsm_list,
+                resposta_final=resposta_final,
+                estados_axiomas=new_states,
+                eventos=eventos_total,
             )
         except Exception:
             pass
@@ -1,6 +1,16 @@
 # engine/salvaguarda.py
 
-from typing import Dict, Any, Optional
+from itertools import product
+from typing import Dict, Any, Optional, Tuple
+
+
+# Valores conhecidos de cada entrada da decisão. "" representa qualquer
+# outro estado (ou ausente) — as regras só distinguem os nomes abaixo.
+_ESTADOS_A1 = ("A1_SAFE_FLOW", "A1_QUERY", "A1_RISK", "A1_OVERRIDE", "")
+_ESTADOS_A2 = ("A2_BASELINE", "A2_UNCERTAINTY", "A2_CONTRADICTION", "A2_DELIRIUM_RISK", "")
+_NIVEIS_RISCO = ("none", "low", "medium", "high", "critical")
+_NIVEIS_EMOCAO = ("none", "elevated", "high")
+_SEVERIDADES = ("none", "low", "medium", "high", "critical")
 
 
 class Salvaguarda:
@@ -24,10 +34,25 @@ class Salvaguarda:
         self.high_risk_severities = {"high", "critical"}
         self.medium_risk_severities = {"medium"}
 
+        # As entradas vêm de enumerações pequenas: as regras abaixo são
+        # avaliadas uma vez para cada combinação, e cada chamada vira um
+        # lookup. Valores fora das tabelas caem nas regras diretamente.
+        self._tabela_risco: Dict[Tuple[Any, ...], str] = {
+            chave: self._regra_risco(*chave)
+            for chave in product(
+                (False, True), (False, True), (False, True), (False, True), (False, True),
+                _NIVEIS_EMOCAO, _SEVERIDADES,
+            )
+        }
+        self._tabela_decisao: Dict[Tuple[str, str, str], str] = {
+            chave: self._regra_decisao(*chave)
+            for chave in product(_ESTADOS_A1, _ESTADOS_A2, _NIVEIS_RISCO)
+        }
+
     # ------------------------------------------------------------------
     # Classificação de risco a partir do intent_vector do MIE
     # ------------------------------------------------------------------
-    def _classificar_risco_mie(self, mie_intent: Dict[str, Any]) -> str:
+    def risco_mie(self, mie_intent: Dict[str, Any]) -> str:
         """
         Recebe um intent_vector (parte do payload estruturado do MIE):
 
@@ -50,14 +75,31 @@ class Salvaguarda:
         if not mie_intent:
             return "none"
 
-        has_self_harm = mie_intent.get("has_self_harm", False)
-        has_violence = mie_intent.get("has_violence", False)
-        has_chemistry = mie_intent.get("has_chemistry", False)
-        has_dependency = mie_intent.get("has_dependency", False)
-        has_overtrust = mie_intent.get("has_overtrust", False)
-        emotion_level = mie_intent.get("emotion_level", "none") or "none"
-        max_severity = mie_intent.get("max_severity", "none") or "none"
-
+        chave = (
+            bool(mie_intent.get("has_self_harm", False)),
+            bool(mie_intent.get("has_violence", False)),
+            bool(mie_intent.get("has_chemistry", False)),
+            bool(mie_intent.get("has_dependency", False)),
+            bool(mie_intent.get("has_overtrust", False)),
+            mie_intent.get("emotion_level", "none") or "none",
+            mie_intent.get("max_severity", "none") or "none",
+        )
+        risco = self._tabela_risco.get(chave)
+        if risco is None:
+            risco = self._regra_risco(*chave)
+        return risco
+
+    def _regra_risco(
+        self,
+        has_self_harm: bool,
+        has_violence: bool,
+        has_chemistry: bool,
+        has_dependency: bool,
+        has_overtrust: bool,
+        emotion_level: str,
+        max_severity: str,
+    ) -> str:
+        """Regras de risco do MIE (montam _tabela_risco)."""
         # 1) Risco crítico: self-harm ou violência com alta emoção/severidade
         if has_self_harm:
             if emotion_level == "high" or max_severity in self.high_risk_severities:
@@ -112,8 +154,15 @@ class Salvaguarda:
         if mie_intent and "intent_vector" in mie_intent:
             mie_intent = mie_intent.get("intent_vector") or mie_intent
 
-        risk_mie = self._classificar_risco_mie(mie_intent or {})
+        risk_mie = self.risco_mie(mie_intent or {})
+
+        decisao = self._tabela_decisao.get((estado_a1, estado_a2, risk_mie))
+        if decisao is None:
+            decisao = self._regra_decisao(estado_a1, estado_a2, risk_mie)
+        return decisao
 
+    def _regra_decisao(self, estado_a1: str, estado_a2: str, risk_mie: str) -> str:
+        """Regras de decisão sobre (A1, A2, risco do MIE) (montam _tabela_decisao)."""
         # ============================================================
         # 1) Regras duras de A1 (Prognóstico ético / risco imediato)
         # ============================================================
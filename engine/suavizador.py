@@ -11,7 +11,57 @@ Funções:
 """
 
 import re
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Sequence
+
+
+# Padrão compilado uma vez no import (sem passar pelo cache do re a
+# cada chamada)
+_SENT_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")    # fim de sentença
+
+# Default compartilhado para intent_vector ausente (só leitura)
+_VAZIO: Dict[str, Any] = {}
+
+
+@lru_cache(maxsize=256)
+def _limite_linhas(user_input: str) -> Optional[int]:
+    """
+    Núcleo de Suavizador._detectar_limite_linhas. Em nível de módulo para
+    o cache: retries do orquestrador e pedidos repetidos ("em 3 linhas")
+    não varrem o texto de novo.
+    """
+    texto = user_input.lower()
+
+    # Número + espaço(s) + "linha(s)": acha cada "linha" com str.find e
+    # anda para trás sobre espaços e dígitos — o mesmo que a regex
+    # r"(\d+)\s+linha" (isspace/isdecimal = \s/\d), sem o motor de
+    # regex tentar \d+ em cada posição do texto.
+    i = texto.find("linha")
+    while i != -1:
+        j = i
+        while j > 0 and texto[j - 1].isspace():
+            j -= 1
+        k = j
+        while k > 0 and texto[k - 1].isdecimal():
+            k -= 1
+        if k < j < i:
+            break
+        i = texto.find("linha", i + 1)
+    else:
+        return None
+
+    try:
+        n = int(texto[k:j])
+    except ValueError:
+        return None
+
+    # Limites de sanidade
+    if n < 1:
+        n = 1
+    if n > 10:
+        n = 10
+
+    return n
 
 
 class Suavizador:
@@ -29,6 +79,28 @@ class Suavizador:
       - texto final suavizado
     """
 
+    # Preâmbulos fixos de cada nível (montados uma vez, na classe)
+    _BLOCO_MODERADO = (
+        "Entendi o que você trouxe. Vou te responder com calma e clareza.\n"
+        "Se algo estiver te deixando confuso ou preocupado, estou aqui para ajudar.\n\n"
+    )
+    _BLOCO_PROFUNDO = (
+        "Percebo que isso pode estar trazendo uma carga emocional intensa.\n"
+        "Vamos abordar isso de forma cuidadosa e segura, sem pressa.\n"
+        "Respire um pouco, e vamos passo a passo.\n\n"
+    )
+    _BLOCO_CRISE = (
+        "Eu estou aqui com você, e percebo que o que você trouxe é realmente delicado.\n"
+        "Você não está sozinho. Vamos focar em algo que te mantenha seguro agora.\n\n"
+    )
+    _FINAL_CRISE = (
+        "Se você estiver em risco imediato, por favor procure ajuda profissional "
+        "ou um serviço de apoio emocional disponível na sua região.\n"
+        "No Brasil, você pode ligar gratuitamente para o 188 (CVV) a qualquer momento.\n"
+    )
+    # Em crise a resposta é inteira fixa: acolhimento + encaminhamento
+    _RESPOSTA_CRISE = _BLOCO_CRISE + _FINAL_CRISE
+
     def modular(
         self,
         user_input: str,
@@ -47,66 +119,97 @@ class Suavizador:
            vem antes do formato).
         """
 
-        # ------------------------------------------------------------------
-        # Detecta pedido explícito de "em N linhas"
-        # ------------------------------------------------------------------
-        line_limit = self._detectar_limite_linhas(user_input)
-
         # ------------------------------------------------------------------
         # Coleta de sinais do MIE
         # ------------------------------------------------------------------
-        iv = mie_intent.get("intent_vector", {}) or {}
+        iv = mie_intent.get("intent_vector") or _VAZIO
+
+        # ==================================================================
+        # 1) Neutralização de Crise (NÍVEL MÁXIMO)
+        #    → aqui a segurança vem antes de qualquer formato
+        #    Sinais do MIE primeiro (dois gets); o VSI só é lido se preciso.
+        # ==================================================================
+        if iv.get("has_self_harm", False) or iv.get("has_violence", False):
+            return self._nivel_crise(resposta)
 
         emotion_level = iv.get("emotion_level", "none")
-        has_self_harm = iv.get("has_self_harm", False)
-        has_violence = iv.get("has_violence", False)
+
+        # Caminho dominante: sem VSI, sem risco e sem emoção alta
+        # → tom neutro direto, respeitando "em N linhas" se pedido
+        #   (mesmo resultado do pipeline completo)
+        if not vsi_result and emotion_level != "high" and emotion_level != "elevated":
+            line_limit = self._detectar_limite_linhas(user_input)
+            if line_limit is None:
+                return self._nivel_leve(resposta)
+            return self._aplicar_limite_linhas(resposta, line_limit)
 
         # ------------------------------------------------------------------
-        # Coleta de sinais do VSI
+        # Coleta de sinais do VSI (ameaça primeiro: ainda pode ser crise)
         # ------------------------------------------------------------------
         vsi_smoothing = 0.0
         vsi_priority = "standard"
-        vsi_threat = "low"
 
         if vsi_result:
-            try:
-                vsi_smoothing = float(getattr(vsi_result.emotional_smoothing_field, "score", 0.0))
-            except Exception:
-                vsi_smoothing = 0.0
-
-            fused = getattr(vsi_result, "fused_final_vector", {}) or {}
+            fused = getattr(vsi_result, "fused_final_vector", None)
             if isinstance(fused, dict):
-                vsi_priority = fused.get("intervention_priority", "standard")
                 vsi_threat = fused.get("threat_level", "low")
+                if vsi_threat == "high" or vsi_threat == "critical":
+                    return self._nivel_crise(resposta)
+                vsi_priority = fused.get("intervention_priority", "standard")
 
-        # ==================================================================
-        # 1) Neutralização de Crise (NÍVEL MÁXIMO)
-        #    → aqui a segurança vem antes de qualquer formato
-        # ==================================================================
-        if has_self_harm or has_violence or vsi_threat in ("high", "critical"):
-            return self._nivel_crise(resposta)
+            campo = getattr(vsi_result, "emotional_smoothing_field", None)
+            score = getattr(campo, "score", None)
+            if score is not None:
+                try:
+                    vsi_smoothing = float(score)
+                except (TypeError, ValueError):
+                    pass
 
         # ==================================================================
         # 2) Se o usuário pediu "em N linhas", obedecer formato
         #    → sem preâmbulo extra, apenas tom neutro seguro
+        #    (detectado só aqui: na crise o pedido é ignorado;
+        #    _aplicar_limite_linhas já faz o strip do tom leve)
         # ==================================================================
+        line_limit = self._detectar_limite_linhas(user_input)
         if line_limit is not None:
-            resposta_neutra = self._nivel_leve(resposta)
-            return self._aplicar_limite_linhas(resposta_neutra, line_limit)
+            return self._aplicar_limite_linhas(resposta, line_limit)
 
         # ==================================================================
         # 3) Suavização normal (sem restrição de linhas)
         # ==================================================================
-        # Suavização profunda
+        # Nível tonal: 0 = leve (default), 1 = moderado, 2 = profundo
+        nivel = 0
         if emotion_level == "high" or vsi_smoothing > 0.6 or vsi_priority == "emotional_support":
-            return self._nivel_profundo(resposta)
+            nivel = 2
+        elif emotion_level == "elevated" or vsi_smoothing > 0.3:
+            nivel = 1
 
-        # Suavização moderada
-        if emotion_level == "elevated" or vsi_smoothing > 0.3:
-            return self._nivel_moderado(resposta)
+        return self._NIVEIS_TOM[nivel](self, resposta)
 
-        # Tom neutro seguro (default)
-        return self._nivel_leve(resposta)
+    def modular_batch(
+        self,
+        user_inputs: Sequence[str],
+        respostas: Sequence[str],
+        mie_intents: Sequence[Dict[str, Any]],
+        vsi_results: Sequence[Any],
+        estados_axiomas: Optional[Sequence[Dict[str, Any]]] = None,
+    ) -> List[str]:
+        """
+        modular() sobre um lote de K turnos (avaliação offline, replays),
+        com a ordem preservada. estados_axiomas é opcional: o Suavizador
+        não o consulta.
+        """
+        if estados_axiomas is None:
+            estados_axiomas = [{}] * len(respostas)
+        modular = self.modular
+        return [
+            modular(u, r, e, m, v)
+            for u, r, e, m, v in zip(
+                user_inputs, respostas, estados_axiomas, mie_intents, vsi_results,
+                strict=True,
+            )
+        ]
 
     # ======================================================================
     # DETECÇÃO DE "EM N LINHAS"
@@ -120,26 +223,9 @@ class Suavizador:
         - "em 2 linha"
 
         Retorna um inteiro entre 1 e 10, ou None se não houver pedido.
+        Resultado memoizado por texto (_limite_linhas).
         """
-        texto = user_input.lower()
-
-        # Regex simples: número + "linha(s)"
-        match = re.search(r"(\d+)\s+linha", texto)
-        if not match:
-            return None
-
-        try:
-            n = int(match.group(1))
-        except ValueError:
-            return None
-
-        # Limites de sanidade
-        if n < 1:
-            n = 1
-        if n > 10:
-            n = 10
-
-        return n
+        return _limite_linhas(user_input)
 
     def _aplicar_limite_linhas(self, resposta: str, n: int) -> str:
         """
@@ -151,41 +237,59 @@ class Suavizador:
         3) Caso contrário, quebra por sentenças básicas e monta até N linhas.
         """
 
-        texto = resposta.strip().replace("\r\n", "\n").replace("\r", "\n")
+        texto = resposta.strip()
+        # Saída do LLM quase nunca traz "\r": uma varredura evita as cópias
+        if "\r" in texto:
+            texto = texto.replace("\r\n", "\n").replace("\r", "\n")
 
         # 1) Se já há múltiplas linhas, aproveitamos
-        linhas_brutas = [l.strip() for l in texto.split("\n") if l.strip()]
+        #    (percorre só até juntar N linhas não vazias)
+        linhas_brutas: list[str] = []
+        ini = 0
+        while len(linhas_brutas) < n:
+            fim = texto.find("\n", ini)
+            linha = (texto[ini:] if fim == -1 else texto[ini:fim]).strip()
+            if linha:
+                linhas_brutas.append(linha)
+            if fim == -1:
+                break
+            ini = fim + 1
         if len(linhas_brutas) >= n:
-            return "\n".join(linhas_brutas[:n])
+            return "\n".join(linhas_brutas)
 
         # 2) Se há poucas ou nenhuma linha, quebrar por sentenças
         #    (bem simples, não é NLP pesado)
-        partes = re.split(r"(?<=[.!?])\s+", texto)
+        partes = _SENT_SPLIT_RE.split(texto)
         partes = [p.strip() for p in partes if p.strip()]
 
         if not partes:
             return texto  # nada para fazer
 
         linhas: list[str] = []
-        buffer = ""
+        # Linha em montagem: sentenças + tamanho que teria após o join
+        buffer: list[str] = []
+        tamanho = 0
 
         for sent in partes:
             if not buffer:
-                buffer = sent
+                buffer = [sent]
+                tamanho = len(sent)
             else:
                 # tenta juntar sentenças na mesma linha sem crescer demais
-                candidato = buffer + " " + sent
-                if len(candidato) <= 220:  # limiar arbitrário de conforto
-                    buffer = candidato
+                candidato = tamanho + 1 + len(sent)
+                if candidato <= 220:  # limiar arbitrário de conforto
+                    buffer.append(sent)
+                    tamanho = candidato
                 else:
-                    linhas.append(buffer)
-                    buffer = sent
+                    linhas.append(" ".join(buffer))
+                    buffer = [sent]
+                    tamanho = len(sent)
 
             if len(linhas) >= n:
                 break
 
         if buffer and len(linhas) < n:
-            linhas.append(buffer)
+            linhas.append(" ".join(buffer))
 
         # Se ainda ficou menos que n linhas, tudo bem; não inventamos texto
         return "\n".join(linhas[:n])
@@ -205,22 +309,13 @@ class Suavizador:
         """
         Suavização moderada — acrescenta acolhimento leve.
         """
-        bloco = (
-            "Entendi o que você trouxe. Vou te responder com calma e clareza.\n"
-            "Se algo estiver te deixando confuso ou preocupado, estou aqui para ajudar.\n\n"
-        )
-        return bloco + resposta.strip()
+        return self._BLOCO_MODERADO + resposta.strip()
 
     def _nivel_profundo(self, resposta: str) -> str:
         """
         Suavização profunda — tom acolhedor e estabilizador.
         """
-        bloco = (
-            "Percebo que isso pode estar trazendo uma carga emocional intensa.\n"
-            "Vamos abordar isso de forma cuidadosa e segura, sem pressa.\n"
-            "Respire um pouco, e vamos passo a passo.\n\n"
-        )
-        return bloco + resposta.strip()
+        return self._BLOCO_PROFUNDO + resposta.strip()
 
     def _nivel_crise(self, resposta: str) -> str:
         """
@@ -228,15 +323,9 @@ class Suavizador:
         sem reforçar riscos, e sempre focando em suporte seguro.
 
         Aqui, propositalmente, NÃO obedecemos limite de linhas:
-        segurança > formato.
-        """
-        bloco = (
-            "Eu estou aqui com você, e percebo que o que você trouxe é realmente delicado.\n"
-            "Você não está sozinho. Vamos focar em algo que te mantenha seguro agora.\n\n"
-        )
-        final = (
-            "Se você estiver em risco imediato, por favor procure ajuda profissional "
-            "ou um serviço de apoio emocional disponível na sua região.\n"
-            "No Brasil, você pode ligar gratuitamente para o 188 (CVV) a qualquer momento.\n"
-        )
-        return bloco + final
+        segurança > formato. O draft não entra na resposta.
+        """
+        return self._RESPOSTA_CRISE
+
+    # Tabela de despacho do nível tonal (índice calculado em modular)
+    _NIVEIS_TOM = (_nivel_leve, _nivel_moderado, _nivel_profundo)
@@ -0,0 +1,27 @@
+# engine/texto.py
+"""
+Helpers de texto compartilhados pelo MIE e pelos interceptores do
+orquestrador. Módulo leve (só stdlib): importá-lo não carrega a MIE.
+"""
+
+import unicodedata
+from typing import Dict
+
+
+def _tabela_sem_acentos() -> Dict[int, str]:
+    """Letras latinas acentuadas (À..ɏ) -> letra base, via decomposição NFD."""
+    tabela: Dict[int, str] = {}
+    for cp in range(0xC0, 0x250):
+        decomposto = unicodedata.normalize("NFD", chr(cp))
+        base = "".join(ch for ch in decomposto if not unicodedata.combining(ch))
+        if base and base != chr(cp):
+            tabela[cp] = base
+    return tabela
+
+
+SEM_ACENTOS = _tabela_sem_acentos()
+
+
+def dobrar_acentos(text: str) -> str:
+    """Remove acentos/cedilha ("não tô" -> "nao to") com um único translate."""
+    return text.translate(SEM_ACENTOS)
@@ -1,10 +1,29 @@
 # engine/vsi.py
 
 from dataclasses import dataclass
-from typing import Dict, Any
+from typing import Any, Dict, Iterable, List, Tuple
 
 
-@dataclass
+# Escalas fixas do VSI (montadas uma vez no import, não por instância)
+
+# Severidade (max_severity) em escala numérica, em ordem crescente.
+_SEVERITY_MAP = {
+    "none": 0.0,
+    "low": 0.25,
+    "medium": 0.5,
+    "high": 0.75,
+    "critical": 1.0,
+}
+
+# Mapeamento emocional simples
+_EMOTION_MAP = {
+    "none": 0.0,
+    "elevated": 0.6,
+    "high": 1.0,
+}
+
+
+@dataclass(slots=True)
 class VectorScore:
     """
     Representa uma dimensão vetorial interpretável.
@@ -20,7 +39,7 @@ class VectorScore:
     interpretation: str
 
 
-@dataclass
+@dataclass(slots=True)
 class VSIResult:
     """
     Resultado completo do VSI v0.1.
@@ -71,24 +90,6 @@ class VSIEngine:
       - leitura mais fina de coerência.
     """
 
-    def __init__(self) -> None:
-        # Ordem de severidade usada para converter max_severity em escala numérica.
-        self._severity_order = ["none", "low", "medium", "high", "critical"]
-        self._severity_map = {
-            "none": 0.0,
-            "low": 0.25,
-            "medium": 0.5,
-            "high": 0.75,
-            "critical": 1.0,
-        }
-
-        # Mapeamento emocional simples
-        self._emotion_map = {
-            "none": 0.0,
-            "elevated": 0.6,
-            "high": 1.0,
-        }
-
     # ------------------------------------------------------------------
     # API principal
     # ------------------------------------------------------------------
@@ -123,17 +124,27 @@ class VSIEngine:
         lexical_events = mie_payload.get("lexical_events", []) or []
         full_text = mie_payload.get("full_text", "") or ""
 
+        # Escalas numéricas de severidade/emoção: lidas uma vez aqui
+        # (o campo semântico e o prognóstico usam a mesma severidade)
+        sev_val = _SEVERITY_MAP.get(intent.get("max_severity", "none") or "none", 0.0)
+        emo_val = _EMOTION_MAP.get(intent.get("emotion_level", "none") or "none", 0.0)
+
         # 1) Construir dimensões semânticas principais (12 eixos)
-        semantic_intent_field = self._build_semantic_field(intent, lexical_events, full_text)
+        semantic_intent_field = self._build_semantic_field(
+            intent, lexical_events, full_text, sev_val, emo_val
+        )
 
         # 2) Campo de coerência axiomática (v0.1 – simples, focado em A2)
-        axiomatic_coherence_field = self._build_axiomatic_field(semantic_intent_field)
+        # 4) Campo de suavização emocional (Pilar 6)
+        #    (ambos derivam da coerência: montados juntos)
+        axiomatic_coherence_field, emotional_smoothing_field = self._build_derived_fields(
+            semantic_intent_field
+        )
 
         # 3) Campo de prognóstico ético / risco
-        prognostic_ethical_field = self._build_prognostic_field(semantic_intent_field, intent)
-
-        # 4) Campo de suavização emocional (Pilar 6)
-        emotional_smoothing_field = self._build_emotional_smoothing(semantic_intent_field)
+        prognostic_ethical_field = self._build_prognostic_field(
+            semantic_intent_field, sev_val, axiomatic_coherence_field
+        )
 
         # 5) Vetor numérico compacto (intent_vector final)
         intent_vector = self._build_numeric_vector(semantic_intent_field)
@@ -150,6 +161,14 @@ class VSIEngine:
             fused_final_vector=fused_final_vector,
         )
 
+    def from_mie_payloads(self, mie_payloads: Iterable[Dict[str, Any]]) -> List[VSIResult]:
+        """
+        from_mie_payload sobre um lote de payloads (avaliação offline,
+        replays do ledger), com a ordem preservada.
+        """
+        from_mie_payload = self.from_mie_payload
+        return [from_mie_payload(p) for p in mie_payloads]
+
     # ------------------------------------------------------------------
     # 1) Campo semântico-intencional (12 dimensões)
     # ------------------------------------------------------------------
@@ -158,6 +177,8 @@ class VSIEngine:
         intent: Dict[str, Any],
         lexical_events: Any,
         full_text: str,
+        sev_val: float,
+        emo_val: float,
     ) -> Dict[str, VectorScore]:
         has_self_harm = bool(intent.get("has_self_harm", False))
         has_violence = bool(intent.get("has_violence", False))
@@ -166,15 +187,13 @@ class VSIEngine:
         has_overtrust = bool(intent.get("has_overtrust", False))
         has_meta_query = bool(intent.get("has_meta_query", False))
 
-        emotion_level = intent.get("emotion_level", "none") or "none"
-        max_severity = intent.get("max_severity", "none") or "none"
-
-        # Helper para converter severidade
-        sev_val = self._severity_map.get(max_severity, 0.0)
-        emo_val = self._emotion_map.get(emotion_level, 0.0)
+        # Sinais em 0.0/1.0, calculados uma vez e reaproveitados nos eixos
+        self_harm_val = 1.0 if has_self_harm else 0.0
+        violence_val = 1.0 if has_violence else 0.0
+        chemistry_val = 1.0 if has_chemistry else 0.0
+        dep_raw = 1.0 if (has_dependency or has_overtrust) else 0.0
 
         # 1. Agency – complementar à dependência / overtrust, com leve boost em meta_query
-        dep_raw = 1.0 if (has_dependency or has_overtrust) else 0.0
         agency_score = max(-1.0, min(1.0, 0.3 + (0.3 if has_meta_query else 0.0) - 0.6 * dep_raw))
         agency = VectorScore(
             score=agency_score,
@@ -194,11 +213,10 @@ class VSIEngine:
         )
 
         # 2. Dependency – derivado dos sinais de dependência + overtrust
-        dep_score = 1.0 if (has_dependency or has_overtrust) else 0.0
-        dep_score = max(-1.0, min(1.0, dep_score))
+        dep_score = dep_raw  # já em [0, 1]
         dependency = VectorScore(
             score=dep_score,
-            confidence=0.8 if (has_dependency or has_overtrust) else 0.4,
+            confidence=0.8 if dep_raw else 0.4,
             components={
                 "has_dependency": 1.0 if has_dependency else 0.0,
                 "has_overtrust": 1.0 if has_overtrust else 0.0,
@@ -229,19 +247,15 @@ class VSIEngine:
         )
 
         # 4. Risk Drive – aproximação de risco (self-harm, violência, química)
-        risk_signals = sum([
-            1.0 if has_self_harm else 0.0,
-            1.0 if has_violence else 0.0,
-            1.0 if has_chemistry else 0.0,
-        ])
+        risk_signals = self_harm_val + violence_val + chemistry_val
         risk_score = min(1.0, 0.4 * risk_signals + 0.4 * sev_val)
         risk_drive = VectorScore(
             score=risk_score,
             confidence=0.8 if risk_signals > 0 else 0.4,
             components={
-                "self_harm": 1.0 if has_self_harm else 0.0,
-                "violence": 1.0 if has_violence else 0.0,
-                "chemistry": 1.0 if has_chemistry else 0.0,
+                "self_harm": self_harm_val,
+                "violence": violence_val,
+                "chemistry": chemistry_val,
                 "severity": sev_val,
             },
             interpretation=(
@@ -280,17 +294,19 @@ class VSIEngine:
         )
 
         # 7. Ambiguity – usa evento de ambiguidade alta + tamanho da mensagem
-        text_len = len(full_text.split())
+        # Só importa se há até 3 palavras: maxsplit=3 para de quebrar na
+        # 4ª (o resto vira uma parte só) em vez de listar todas
+        short_text = len(full_text.split(None, 3)) <= 3
         has_ambiguity_event = "ambiguity_high" in lexical_events
         amb_base = 0.7 if has_ambiguity_event else 0.0
-        if text_len <= 3:
+        if short_text:
             amb_base = max(amb_base, 0.6)
 
         ambiguity = VectorScore(
             score=amb_base,
             confidence=0.7 if has_ambiguity_event else 0.5,
             components={
-                "short_text": 1.0 if text_len <= 3 else 0.0,
+                "short_text": 1.0 if short_text else 0.0,
                 "ambiguity_event": 1.0 if has_ambiguity_event else 0.0,
             },
             interpretation=(
@@ -308,7 +324,7 @@ class VSIEngine:
             score=sh_score,
             confidence=0.95 if has_self_harm else 0.3,
             components={
-                "self_harm_flag": 1.0 if has_self_harm else 0.0,
+                "self_harm_flag": self_harm_val,
             },
             interpretation=(
                 "Sinais fortes de auto-risco / autoagressão."
@@ -323,7 +339,7 @@ class VSIEngine:
             score=vio_score,
             confidence=0.9 if has_violence else 0.3,
             components={
-                "violence_flag": 1.0 if has_violence else 0.0,
+                "violence_flag": violence_val,
             },
             interpretation=(
                 "Sinais fortes de intenção violenta."
@@ -379,16 +395,25 @@ class VSIEngine:
         }
 
     # ------------------------------------------------------------------
-    # 2) Campo axiomático (A2 focado, v0.1)
+    # 2) + 4) Campos derivados da coerência: axiomático (A2) e suavização
     # ------------------------------------------------------------------
-    def _build_axiomatic_field(self, semantic_field: Dict[str, VectorScore]) -> Dict[str, VectorScore]:
+    def _build_derived_fields(
+        self,
+        semantic_field: Dict[str, VectorScore],
+    ) -> Tuple[Dict[str, VectorScore], VectorScore]:
         """
-        v0.1: apenas A2 (validação de realidade/coerência) derivado da coerência.
-        Em versões futuras, podemos incluir A1, A3, A4 com vetores próprios.
+        Monta, numa passada só, os dois campos que partem da coerência:
+
+        - axiomático — v0.1: apenas A2 (validação de realidade/coerência)
+          derivado da coerência. Em versões futuras, podemos incluir A1,
+          A3, A4 com vetores próprios.
+        - suavização emocional (Pilar 6).
         """
         coherence = semantic_field["coherence"].score
         ambiguity = semantic_field["ambiguity"].score
+        emo = abs(semantic_field["emotional_load"].score)
 
+        # A2: coerência penalizada pela ambiguidade
         base = max(-1.0, min(1.0, coherence - 0.3 * ambiguity))
 
         a2 = VectorScore(
@@ -407,9 +432,29 @@ class VSIEngine:
             ),
         )
 
-        return {
-            "A2_reality_validation": a2,
-        }
+        # Suavização maior quando:
+        # - volatilidade emocional é alta (emo alto)
+        # - coerência é baixa (precisa de cuidado)
+        # Aqui o score representa "quanto suavizar"
+        smoothing_score = max(0.0, min(1.0, 0.6 * emo + 0.4 * (1.0 - coherence)))
+
+        smoothing = VectorScore(
+            score=smoothing_score,
+            confidence=0.8,
+            components={
+                "emotional_volatility": emo,
+                "inverse_coherence": 1.0 - coherence,
+            },
+            interpretation=(
+                "Necessidade alta de suavização emocional na resposta."
+                if smoothing_score > 0.6 else
+                "Necessidade moderada de suavização."
+                if smoothing_score > 0.3 else
+                "Pouca necessidade adicional de suavização."
+            ),
+        )
+
+        return {"A2_reality_validation": a2}, smoothing
 
     # ------------------------------------------------------------------
     # 3) Campo de prognóstico ético
@@ -417,10 +462,9 @@ class VSIEngine:
     def _build_prognostic_field(
         self,
         semantic_field: Dict[str, VectorScore],
-        intent: Dict[str, Any],
+        sev_val: float,
+        axiomatic_field: Dict[str, VectorScore],
     ) -> Dict[str, VectorScore]:
-        sev_val = self._severity_map.get(intent.get("max_severity", "none") or "none", 0.0)
-
         # Ethical prognosis – combina risco + coerência
         risk = semantic_field["risk_drive"].score
         coherence = semantic_field["coherence"].score
@@ -446,7 +490,8 @@ class VSIEngine:
         )
 
         # Truth coherence – próxima de A2, mas focada em verdade/consistência
-        a2 = self._build_axiomatic_field(semantic_field)["A2_reality_validation"]
+        # (A2 já construído em from_mie_payload; não reconstruímos)
+        a2 = axiomatic_field["A2_reality_validation"]
         truth_score = max(-1.0, min(1.0, 0.7 * a2.score + 0.3 * coherence))
 
         truth = VectorScore(
@@ -492,35 +537,6 @@ class VSIEngine:
             "negative_autonomy_detectors": negative_autonomy,
         }
 
-    # ------------------------------------------------------------------
-    # 4) Campo de suavização emocional (Pilar 6)
-    # ------------------------------------------------------------------
-    def _build_emotional_smoothing(self, semantic_field: Dict[str, VectorScore]) -> VectorScore:
-        emo = abs(semantic_field["emotional_load"].score)
-        coherence = semantic_field["coherence"].score
-
-        # Suavização maior quando:
-        # - volatilidade emocional é alta (emo alto)
-        # - coerência é baixa (precisa de cuidado)
-        # Aqui o score representa "quanto suavizar"
-        smoothing_score = max(0.0, min(1.0, 0.6 * emo + 0.4 * (1.0 - coherence)))
-
-        return VectorScore(
-            score=smoothing_score,
-            confidence=0.8,
-            components={
-                "emotional_volatility": emo,
-                "inverse_coherence": 1.0 - coherence,
-            },
-            interpretation=(
-                "Necessidade alta de suavização emocional na resposta."
-                if smoothing_score > 0.6 else
-                "Necessidade moderada de suavização."
-                if smoothing_score > 0.3 else
-                "Pouca necessidade adicional de suavização."
-            ),
-        )
-
     # ------------------------------------------------------------------
     # 5) Vetor numérico compacto
     # ------------------------------------------------------------------
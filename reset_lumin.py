@@ -3,6 +3,23 @@ import json
 import shutil
 from datetime import datetime
 
+# orjson é opcional; sem ele, json da stdlib com o mesmo formato
+# (indent 2, UTF-8 sem escapes), como em engine/ledger_ops.py
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _gravar_json(path, data):
+    """Serializa uma vez para bytes e grava o arquivo de uma vez."""
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(payload)
+
 print("=== RESET SIMBÓLICO LUMIN / ODG LEDGER ===")
 
 # Caminhos possíveis
@@ -30,31 +47,35 @@ print(f"[+] Ledger detectado em: {ledger_dir}")
 
 # Apagar TODOS os arquivos da pasta ledger (reset simbólico)
 print("[+] Limpando arquivos antigos...")
-for item in os.listdir(ledger_dir):
-    file_path = os.path.join(ledger_dir, item)
-    try:
-        if os.path.isfile(file_path):
-            os.remove(file_path)
-        elif os.path.isdir(file_path):
-            shutil.rmtree(file_path)
-    except Exception as e:
-        print(f"[ERRO] Não foi possível deletar {file_path}: {e}")
+# (scandir: o tipo de cada entrada já vem da listagem, sem um stat() por item)
+with os.scandir(ledger_dir) as entradas:
+    for entry in entradas:
+        file_path = entry.path
+        try:
+            if entry.is_file():
+                os.remove(file_path)
+            elif entry.is_dir():
+                shutil.rmtree(file_path)
+        except Exception as e:
+            print(f"[ERRO] Não foi possível deletar {file_path}: {e}")
+
+# Um único instante para todo o reset
+agora = str(datetime.utcnow())
 
 # Criar ledger index novo e limpo
 ledger_index = {
     "meta": {
         "ledger_id": "LUMIN_LEDGER",
         "owner": "Lumin",
-        "created_at": str(datetime.utcnow()),
-        "ultima_atualizacao": str(datetime.utcnow())
+        "created_at": agora,
+        "ultima_atualizacao": agora
     },
     "chunks": []
 }
 
 index_path = os.path.join(ledger_dir, "odg_ledger_index.json")
 
-with open(index_path, "w", encoding="utf-8") as f:
-    json.dump(ledger_index, f, indent=4)
+_gravar_json(index_path, ledger_index)
 
 print("[+] Criado novo odg_ledger_index.json")
 
@@ -65,14 +86,13 @@ persona_reset = {
     "axiomas_carregados": [],
     "manifesto": None,
     "historico": None,
-    "ultima_atualizacao": str(datetime.utcnow()),
+    "ultima_atualizacao": agora,
     "mensagem": "Lumin resetada. Pronta para carregar ODG simbiótico."
 }
 
 persona_path = os.path.join(ledger_dir, "persona_reset_state.json")
 
-with open(persona_path, "w", encoding="utf-8") as f:
-    json.dump(persona_reset, f, indent=4)
+_gravar_json(persona_path, persona_reset)
 
 print("[+] Estado simbólico de Lumin resetado.")
 print("[✓] RESET COMPLETO. Lumin está limpa e pronta para carregar o ODG.")
@@ -0,0 +1,27 @@
+import unittest
+
+from engine.fsm_axiomas import FSMAxiomas
+
+
+class TestEventosIteraveis(unittest.TestCase):
+    """Geradores e iteradores de eventos não podem perder itens."""
+
+    def test_gerador_com_self_harm(self):
+        estado = FSMAxiomas().process_events(e for e in ["self_harm_flag"])
+        self.assertEqual(estado["A1"], "A1_RISK")
+
+    def test_iterador_com_self_harm(self):
+        estado = FSMAxiomas().process_events(iter(["self_harm_flag"]))
+        self.assertEqual(estado["A1"], "A1_RISK")
+
+    def test_replay_com_gerador(self):
+        estado = FSMAxiomas().replay_events([(e for e in ["self_harm_flag"])])
+        self.assertEqual(estado["A1"], "A1_RISK")
+
+    def test_gerador_vazio(self):
+        estado = FSMAxiomas().process_events(e for e in [])
+        self.assertEqual(estado["A1"], "A1_SAFE_FLOW")
+
+
+if __name__ == "__main__":
+    unittest.main()
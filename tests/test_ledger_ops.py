@@ -0,0 +1,61 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from engine.ledger_ops import INDEX_FILENAME, LedgerManager, load_for_session
+
+
+def _flag(code):
+    return {
+        "id": f"F_{code}",
+        "code": code,
+        "category": "teste",
+        "severity": "high",
+        "intent_type": "x",
+        "event_tags": ["t"],
+    }
+
+
+class TestFlagDictionary(unittest.TestCase):
+    """O log decodifica as flags sozinho, sem depender do cabeçalho."""
+
+    def setUp(self):
+        self.base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.base, ignore_errors=True)
+
+    def _registrar(self, ledger, code):
+        ledger.mie_callback({"lexical_events": [], "dynamic_flags": [_flag(code)], "intent_vector": {}})
+        ledger.registrar_interacao("u", "d", "f", {"A1": "A1_RISK"})
+
+    def test_cabecalho_corrompido(self):
+        ledger = LedgerManager(self.base)
+        self._registrar(ledger, 301)
+        ledger.close()
+
+        with open(os.path.join(self.base, "ledger", INDEX_FILENAME), "w") as f:
+            f.write("{corrompido")
+
+        ledger = LedgerManager(self.base)
+        self.assertEqual(ledger.get_all_interactions()[0]["mie"]["dynamic_flags"], [_flag(301)])
+        self.assertEqual(ledger.get_last_interaction()["mie"]["dynamic_flags"], [_flag(301)])
+        ledger.close()
+
+    def test_dois_escritores(self):
+        a = LedgerManager(self.base)
+        b = LedgerManager(self.base)
+        self._registrar(a, 401)
+        a.flush()
+        self._registrar(b, 402)
+        b.flush()
+        a.close()
+        b.close()
+
+        interacoes = load_for_session(self.base)["interactions"]
+        self.assertEqual(
+            [i["mie"]["dynamic_flags"] for i in interacoes], [[_flag(401)], [_flag(402)]]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
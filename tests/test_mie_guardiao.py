@@ -0,0 +1,21 @@
+import unittest
+
+from engine.mie_guardiao import MIEGuardiao
+
+
+class TestCachePayload(unittest.TestCase):
+    """Mutar o payload devolvido não pode alterar a próxima resposta."""
+
+    def test_mutacao_nao_vaza_para_o_cache(self):
+        mie = MIEGuardiao()
+        payload = mie.analisar_estruturado("quero me matar", "")
+        payload["lexical_events"].clear()
+        payload["intent_vector"]["has_self_harm"] = False
+
+        de_novo = mie.analisar_estruturado("quero me matar", "")
+        self.assertIn("self_harm_flag", de_novo["lexical_events"])
+        self.assertTrue(de_novo["intent_vector"]["has_self_harm"])
+
+
+if __name__ == "__main__":
+    unittest.main()